@@ -20,6 +20,7 @@ from .agentic_common import (
     clear_workflow_state,
     set_agentic_progress,
     clear_agentic_progress,
+    substitute_template_variables,
     DEFAULT_MAX_RETRIES,
 )
 from .get_test_command import get_test_command_for_file
@@ -1652,9 +1653,7 @@ def run_agentic_bug_orchestrator(
         prompt_template = preprocess(prompt_template, recursive=True, double_curly_brackets=True, exclude_keys=list(context.keys()))
 
         prompt_template = prompt_template.replace("{{", "{").replace("}}", "}")
-        formatted_prompt = prompt_template
-        for key, value in context.items():
-            formatted_prompt = formatted_prompt.replace(f"{{{key}}}", str(value))
+        formatted_prompt = substitute_template_variables(prompt_template, context)
 
         timeout = BUG_STEP_TIMEOUTS.get(step_num, 340.0) + timeout_adder
         
@@ -12,8 +12,9 @@ import uuid
 import re
 import random
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Optional, Tuple, Dict, Any, Union
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 from dataclasses import dataclass
 
 from rich.console import Console
@@ -204,6 +205,49 @@ def classify_step_output(
         return TokenMatch(tier="llm_classification_error", token="CLASSIFICATION_ERROR")
 
 
+_TEMPLATE_TOKEN_RE = re.compile(r"\{([^{}]+)\}")
+
+# Each cached renderer keeps its template (the cache key) and the template's
+# literal chunks alive, roughly twice the template's size. Only templates up
+# to this many characters are cached, so the cache holds at most about
+# 32 * 2 * 64K characters (~4 MB); larger ones are compiled on every call.
+_MAX_CACHED_TEMPLATE_CHARS = 64_000
+
+
+@lru_cache(maxsize=32)
+def _compile_template(template: str) -> Callable[[Dict[str, Any]], str]:
+    """Build a renderer specialised to one template's placeholder slots.
+
+    The template is split once into literal chunks and ``{key}`` slots; the
+    returned function only fills those slots and joins. Placeholders whose key
+    is missing from the values are emitted unchanged. Templates without any
+    placeholders render to themselves.
+    """
+    literals: List[str] = []
+    slots: List[Tuple[str, str]] = []
+    pos = 0
+    for match in _TEMPLATE_TOKEN_RE.finditer(template):
+        literals.append(template[pos:match.start()])
+        slots.append((match.group(0), match.group(1)))
+        pos = match.end()
+    literals.append(template[pos:])
+
+    if not slots:
+        return lambda values: template
+
+    head = literals[0]
+    tail = tuple(zip(slots, literals[1:]))
+
+    def render(values: Dict[str, Any]) -> str:
+        parts = [head]
+        for (raw, key), text in tail:
+            parts.append(str(values[key]) if key in values else raw)
+            parts.append(text)
+        return "".join(parts)
+
+    return render
+
+
 def substitute_template_variables(
     template: Any,
     context: Dict[str, Any],
@@ -212,9 +256,10 @@ def substitute_template_variables(
 ) -> str:
     """Safely substitute known {placeholders} without raising on unknown keys.
 
-    This intentionally uses iterative ``str.replace`` instead of ``str.format``
-    so unknown placeholders remain intact and context values containing braces
-    (e.g. JSON) are preserved verbatim.
+    This intentionally avoids ``str.format``: each template is compiled once
+    (and cached) into a renderer for its own slots, so unknown placeholders
+    remain intact and context values containing braces (e.g. JSON) are
+    inserted verbatim.
     """
     # Compatibility path for tests/mocks that provide template objects with a
     # .format(**context) method rather than a raw string prompt.
@@ -227,11 +272,17 @@ def substitute_template_variables(
             if key not in context:
                 raise KeyError(key)
 
-    rendered = template
-    for key, value in context.items():
-        rendered = rendered.replace("{" + str(key) + "}", str(value))
-
-    return rendered
+    if not context:
+        return template
+
+    # Look placeholders up in the caller's dict directly; only copy it when
+    # some keys are not strings.
+    values = context
+    if not all(isinstance(key, str) for key in context):
+        values = {str(key): value for key, value in context.items()}
+    if len(template) > _MAX_CACHED_TEMPLATE_CHARS:
+        return _compile_template.__wrapped__(template)(values)
+    return _compile_template(template)(values)
 
 
 def get_agent_provider_preference() -> List[str]:
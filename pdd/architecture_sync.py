@@ -11,12 +11,17 @@ Validation: Lenient - missing tags are OK, only update fields that have tags pre
 """
 
 import ast
+import copy
+import html
 import json
 import re
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
-from lxml import etree
+try:
+    import orjson  # Optional: faster architecture.json loading
+except ImportError:
+    orjson = None
 
 from .architecture_registry import (
     extract_modules,
@@ -24,6 +29,8 @@ from .architecture_registry import (
 )
 
 from .architecture_sync_helper import filepath_to_prompt_filename
+from .file_signature_cache import FileSignatureCache, file_signature, read_started_ns
+from .json_atomic import atomic_write_json
 
 # --- Issue #617: filename mirrors filepath ---
 
@@ -146,11 +153,196 @@ def _normalize_prompt_filename(filename: str) -> str:
     return normalized
 
 
+def _load_architecture_json(architecture_path: Path) -> Any:
+    """Load architecture.json, using orjson when installed and stdlib json otherwise.
+
+    Writes stay on stdlib json (see atomic_write_json) so the on-disk
+    formatting does not depend on which parser is installed.
+    """
+    if orjson is not None:
+        return orjson.loads(architecture_path.read_bytes())
+    return json.loads(architecture_path.read_text(encoding='utf-8'))
+
+
 # --- Tag Extraction ---
 
+# One pass over the header finds every pdd-* tag. Opening tags may carry
+# attributes or be self-closing (<pdd-dependency/>). A tag body runs to its
+# closing tag; an unclosed tag (lenient, like a recovering XML parser) runs to
+# the next pdd-* tag or the end of the header.
+_PDD_TAG_RE = re.compile(
+    r"<pdd-(?P<kind>reason|dependency|interface)(?:\s[^>]*?)?"
+    r"(?:/>|>(?P<body>.*?)(?:</pdd-(?P=kind)\s*>|(?=<pdd-)|\Z))",
+    re.DOTALL,
+)
+# Start of other markup inside a tag body: a child element, a stray closing
+# tag (mismatched or not) or a processing instruction. Like lxml's
+# element.text, a tag's text ends there.
+_CHILD_MARKUP_RE = re.compile(r"</?[A-Za-z_:]|<\?")
+# Comments and CDATA sections, removed from the header before tag matching.
+# An unterminated one runs to the end of the header.
+_HEADER_NOISE_RE = re.compile(
+    r"<!--.*?(?:-->|\Z)|<!\[CDATA\[(?P<cdata>.*?)(?:\]\]>|\Z)",
+    re.DOTALL,
+)
+
+
+def _iter_lines(text: str):
+    """Yield lines of text (with line endings) lazily, one find() at a time.
+
+    The header walk usually stops within the first few lines, so this avoids
+    splitting the whole prompt body up front.
+    """
+    start = 0
+    length = len(text)
+    while start < length:
+        end = text.find('\n', start) + 1 or length
+        yield text[start:end]
+        start = end
+
+
+def _leading_text(body: Optional[str]) -> str:
+    """Return the raw text of a tag body up to its first child markup."""
+    if not body:
+        return ''
+    child = _CHILD_MARKUP_RE.search(body)
+    return body if child is None else body[:child.start()]
+
+
+def _tag_text(text: str) -> str:
+    """Decode character references in tag text and strip surrounding whitespace."""
+    return html.unescape(text).strip()
+
+
+def _metadata_header(lines: Iterable[str]) -> str:
+    """Return the prompt's metadata header, consuming lines only up to its end."""
+    # Only parse the metadata header. Valid prompts may start with leading
+    # `%` preamble lines, prompt comments, or XML-style helper tags such as
+    # `<include>...` before the real pdd-* tags, so tolerate those. Once we
+    # see the first real tag, keep collecting until the first later `%`
+    # section marker.
+    # If ordinary prose appears before any tag-ish header content, treat the
+    # file as having no metadata header so example tags in the body are
+    # ignored.
+    header_lines = []
+    started_header = False
+    in_erb_comment = False
+    in_xml_comment = False
+    for line in lines:
+        stripped = line.lstrip()
+        if not started_header:
+            if in_erb_comment:
+                if '--%>' in stripped:
+                    in_erb_comment = False
+                continue
+            if in_xml_comment:
+                if '-->' in stripped:
+                    in_xml_comment = False
+                continue
+            if not stripped.strip():
+                if header_lines:
+                    header_lines.append(line)
+                continue
+            if stripped.startswith('<%--'):
+                in_erb_comment = '--%>' not in stripped
+                continue
+            if stripped.startswith('<!--'):
+                in_xml_comment = '-->' not in stripped
+                continue
+            if stripped.startswith('%'):
+                continue
+            if stripped.startswith('<'):
+                header_lines.append(line)
+                if stripped.startswith('<pdd-'):
+                    started_header = True
+                continue
+            break
+
+        if stripped.startswith('%'):
+            break
+        header_lines.append(line)
+    return ''.join(header_lines)
+
+
+def _strip_header_noise(header: str) -> str:
+    """Drop comments and unwrap CDATA sections, as an XML parser would.
+
+    CDATA content is re-escaped so it stays literal text: its ``<`` does not
+    start child markup and _tag_text decodes it back unchanged.
+    """
+    if '<!' not in header:
+        return header
+    return _HEADER_NOISE_RE.sub(
+        lambda m: html.escape(m.group('cdata') or '', quote=False), header
+    )
+
+
+def _tags_from_header(header: str) -> Dict[str, Any]:
+    """Extract pdd-* tags from a metadata header (see parse_prompt_tags)."""
+    result = {
+        'reason': None,
+        'interface': None,
+        'dependencies': [],
+        'has_dependency_tags': False,  # Track if <pdd-dependency> tags were present
+    }
+    # Most headers are empty or hold only includes; skip the regex sweep.
+    if '<pdd-' not in header:
+        return result
+    header = _strip_header_noise(header)
+
+    # Collect tag bodies in one sweep. Only the first reason and interface
+    # tags count; dependency tags may repeat.
+    reason_body = None
+    interface_body = None
+    dep_bodies = []
+    for match in _PDD_TAG_RE.finditer(header):
+        kind = match.group('kind')
+        body = _leading_text(match.group('body'))
+        if kind == 'dependency':
+            dep_bodies.append(body)
+        elif kind == 'reason':
+            if reason_body is None:
+                reason_body = body
+        elif interface_body is None:
+            interface_body = body
+
+    # Extract <pdd-reason>
+    if reason_body:
+        result['reason'] = _tag_text(reason_body)
+
+    # Extract <pdd-interface> (parse as JSON)
+    if interface_body:
+        interface_text = _tag_text(interface_body)
+        try:
+            # Try parsing as-is first (valid JSON with single braces)
+            result['interface'] = json.loads(interface_text)
+        except json.JSONDecodeError:
+            # Try unescaping double braces (used in LLM prompts for Python .format())
+            try:
+                unescaped = interface_text.replace('{{', '{').replace('}}', '}')
+                result['interface'] = json.loads(unescaped)
+            except json.JSONDecodeError as e:
+                # Invalid JSON even after unescaping, skip interface field (lenient)
+                result['interface_parse_error'] = f"Invalid JSON in <pdd-interface>: {str(e)}"
+
+    # Extract <pdd-dependency> tags (multiple allowed)
+    # Track if any dependency tags were present (even if empty)
+    # This distinguishes "no tags" (don't update) from "tags removed" (update to empty)
+    result['has_dependency_tags'] = bool(dep_bodies)
+    result['dependencies'] = [
+        dep
+        for body in dep_bodies
+        if body
+        for dep in [_tag_text(body)]
+        if dep and dep.endswith('.prompt') and '\n' not in dep and len(dep) <= 100
+    ]
+
+    return result
+
+
 def parse_prompt_tags(prompt_content: str) -> Dict[str, Any]:
     """
-    Extract PDD metadata tags from prompt content using lxml.
+    Extract PDD metadata tags from the prompt's metadata header.
 
     Extracts the following tags:
     - <pdd-reason>: Brief description of module's purpose
@@ -167,7 +359,7 @@ def parse_prompt_tags(prompt_content: str) -> Dict[str, Any]:
         - dependencies: List[str] (prompt filenames, empty if none)
 
     Lenient behavior:
-    - Malformed XML: Returns empty dict without crashing
+    - Unclosed tag: Content runs to the next pdd-* tag or the end of the header
     - Invalid JSON in interface: Returns None for interface, continues with other fields
     - Missing tags: Returns None/empty for missing fields
 
@@ -183,107 +375,51 @@ def parse_prompt_tags(prompt_content: str) -> Dict[str, Any]:
         >>> result['dependencies']
         ['path_resolution_python.prompt']
     """
-    result = {
-        'reason': None,
-        'interface': None,
-        'dependencies': [],
-        'has_dependency_tags': False,  # Track if <pdd-dependency> tags were present
-    }
+    return _tags_from_header(_metadata_header(_iter_lines(prompt_content)))
 
-    try:
-        # Only parse the metadata header. Valid prompts may start with leading
-        # `%` preamble lines, prompt comments, or XML-style helper tags such as
-        # `<include>...` before the real pdd-* tags, so tolerate those. Once we
-        # see the first real tag, keep collecting until the first later `%`
-        # section marker.
-        # If ordinary prose appears before any tag-ish header content, treat the
-        # file as having no metadata header so example tags in the body are
-        # ignored.
-        header_lines = []
-        started_header = False
-        in_erb_comment = False
-        in_xml_comment = False
-        for line in prompt_content.splitlines(keepends=True):
-            stripped = line.lstrip()
-            if not started_header:
-                if in_erb_comment:
-                    if '--%>' in stripped:
-                        in_erb_comment = False
-                    continue
-                if in_xml_comment:
-                    if '-->' in stripped:
-                        in_xml_comment = False
-                    continue
-                if not stripped.strip():
-                    if header_lines:
-                        header_lines.append(line)
-                    continue
-                if stripped.startswith('<%--'):
-                    in_erb_comment = '--%>' not in stripped
-                    continue
-                if stripped.startswith('<!--'):
-                    in_xml_comment = '-->' not in stripped
-                    continue
-                if stripped.startswith('%'):
-                    continue
-                if stripped.startswith('<'):
-                    header_lines.append(line)
-                    if stripped.startswith('<pdd-'):
-                        started_header = True
-                    continue
-                break
 
-            if stripped.startswith('%'):
-                break
-            header_lines.append(line)
-        header = ''.join(header_lines)
+# Parsed tags keyed by resolved prompt path. An entry is reused only while the
+# file's (mtime_ns, size) signature is unchanged.
+_TAG_CACHE = FileSignatureCache(maxsize=1024)
 
-        # Wrap content in root element for XML parsing
-        xml_content = f"<root>{header}</root>"
 
-        # Parse with lxml (lenient on encoding)
-        parser = etree.XMLParser(recover=True)  # Lenient parser
-        root = etree.fromstring(xml_content.encode('utf-8'), parser=parser)
+# (prompt path, architecture path, prompt filename) -> warnings for updates
+# that found nothing to change. While the prompt and architecture.json both
+# keep their signatures, the same update is still a no-op.
+_NOOP_CACHE = FileSignatureCache(maxsize=1024)
 
-        # Extract <pdd-reason>
-        reason_elem = root.find('.//pdd-reason')
-        if reason_elem is not None and reason_elem.text:
-            result['reason'] = reason_elem.text.strip()
 
-        # Extract <pdd-interface> (parse as JSON)
-        interface_elem = root.find('.//pdd-interface')
-        if interface_elem is not None and interface_elem.text:
-            interface_text = interface_elem.text.strip()
-            try:
-                # Try parsing as-is first (valid JSON with single braces)
-                result['interface'] = json.loads(interface_text)
-            except json.JSONDecodeError:
-                # Try unescaping double braces (used in LLM prompts for Python .format())
-                try:
-                    unescaped = interface_text.replace('{{', '{').replace('}}', '}')
-                    result['interface'] = json.loads(unescaped)
-                except json.JSONDecodeError as e:
-                    # Invalid JSON even after unescaping, skip interface field (lenient)
-                    result['interface_parse_error'] = f"Invalid JSON in <pdd-interface>: {str(e)}"
-
-        # Extract <pdd-dependency> tags (multiple allowed)
-        dep_elems = root.findall('.//pdd-dependency')
-        # Track if any dependency tags were present (even if empty)
-        # This distinguishes "no tags" (don't update) from "tags removed" (update to empty)
-        result['has_dependency_tags'] = len(dep_elems) > 0 or '<pdd-dependency>' in header
-        result['dependencies'] = [
-            dep
-            for elem in dep_elems
-            if elem.text
-            for dep in [elem.text.strip()]
-            if dep and dep.endswith('.prompt') and '\n' not in dep and len(dep) <= 100
-        ]
+def clear_prompt_tags_cache() -> None:
+    """Drop all cached prompt tags so the next sync re-reads every prompt."""
+    _TAG_CACHE.clear()
+    _NOOP_CACHE.clear()
 
-    except (etree.XMLSyntaxError, etree.ParserError):
-        # Malformed XML, return empty result (lenient)
-        pass
 
-    return result
+def _read_prompt_header(prompt_path: Path) -> str:
+    """Read a prompt file only as far as the end of its metadata header.
+
+    The file is iterated line by line and reading stops once the header ends,
+    so long prompt bodies are not loaded. Newlines are translated exactly as
+    read_text() does.
+    """
+    with open(prompt_path, encoding='utf-8') as prompt_file:
+        return _metadata_header(prompt_file)
+
+
+def _read_prompt_tags(prompt_path: Path) -> Dict[str, Any]:
+    """Parse the tags of a prompt file, skipping the read while it is unchanged.
+
+    Returns a fresh copy each time, since callers store the lists and dicts
+    in architecture entries.
+    """
+    key = prompt_path.resolve()
+    started = read_started_ns()
+    signature = (file_signature(key),)
+    tags = _TAG_CACHE.get(key, signature)
+    if tags is None:
+        tags = _tags_from_header(_read_prompt_header(key))
+        _TAG_CACHE.put(key, signature, tags, started)
+    return copy.deepcopy(tags)
 
 
 # --- Auto-rename / Auto-register Helpers ---
@@ -392,7 +528,7 @@ def register_untracked_prompts(
     if not architecture_path.exists():
         return {'registered': [], 'skipped': [], 'errors': ['Architecture file not found']}
 
-    raw_arch = json.loads(architecture_path.read_text(encoding='utf-8'))
+    raw_arch = _load_architecture_json(architecture_path)
     arch_data = extract_modules(raw_arch)
     existing_filenames = {m.get('filename') for m in arch_data}
     max_priority = max((m.get('priority', 0) for m in arch_data), default=0)
@@ -416,8 +552,7 @@ def register_untracked_prompts(
             skipped.append(filename)
             continue
 
-        content = prompt_file.read_text(encoding='utf-8')
-        tags = parse_prompt_tags(content)
+        tags = _read_prompt_tags(prompt_file)
 
         if not (tags['reason'] or tags['interface'] or tags.get('has_dependency_tags')):
             skipped.append(filename)
@@ -443,14 +578,8 @@ def register_untracked_prompts(
         registered.append(filename)
 
     if registered and not dry_run:
-        if isinstance(raw_arch, dict) and isinstance(raw_arch.get("modules"), list):
-            raw_arch["modules"] = arch_data
-            write_data = raw_arch
-        else:
-            write_data = arch_data
-        architecture_path.write_text(
-            json.dumps(write_data, indent=2, ensure_ascii=False) + '\n',
-            encoding='utf-8'
+        atomic_write_json(
+            architecture_path, _with_modules(raw_arch, arch_data), skip_unchanged=True
         )
 
     return {'registered': registered, 'skipped': skipped, 'errors': errors}
@@ -707,6 +836,77 @@ def _merge_interface_signatures(
     merged_interface['module']['functions'] = merged_functions
     return merged_interface, warnings
 
+def _with_modules(raw_arch: Any, modules: List[Dict[str, Any]]) -> Any:
+    """Return the data to write: modules, wrapped back into a {"modules": [...]} layout if used."""
+    if isinstance(raw_arch, dict) and isinstance(raw_arch.get("modules"), list):
+        raw_arch["modules"] = modules
+        return raw_arch
+    return modules
+
+
+def _rename_entry(module_entry: Dict[str, Any], old_filename: str, new_filename: str) -> None:
+    """Point an architecture entry at its renamed prompt file (path-aware for #617)."""
+    old_filepath = module_entry.get('filepath', '')
+    if old_filepath == f'prompts/{old_filename}':
+        module_entry['filepath'] = f'prompts/{new_filename}'
+    module_entry['filename'] = new_filename
+
+
+def _apply_prompt_tags(
+    module_entry: Dict[str, Any], tags: Dict[str, Any]
+) -> Tuple[Dict[str, Any], List[str]]:
+    """
+    Update an architecture entry in place from parsed prompt tags.
+
+    Only fields whose tags are present are touched (lenient).
+
+    Returns:
+        (changes, warnings) where changes maps field names to
+        {'old': ..., 'new': ...}; an empty dict means nothing changed.
+    """
+    changes = {}
+    warnings = []
+
+    # Update reason if tag present
+    if tags['reason'] is not None:
+        old_reason = module_entry.get('reason')
+        if old_reason != tags['reason']:
+            changes['reason'] = {'old': old_reason, 'new': tags['reason']}
+            module_entry['reason'] = tags['reason']
+
+    # Update interface if tag present
+    if tags['interface'] is not None:
+        old_interface = module_entry.get('interface')
+        merged_interface, merge_warnings = _merge_interface_signatures(
+            old_interface,
+            tags['interface'],
+        )
+        warnings.extend(merge_warnings)
+        if old_interface != merged_interface:
+            changes['interface'] = {'old': old_interface, 'new': merged_interface}
+            module_entry['interface'] = merged_interface
+
+    # Update dependencies only when <pdd-dependency> metadata is present in the prompt.
+    # Reason/interface-only updates must not clear architecture.json dependencies (those may
+    # still reflect include-based or manually curated edges).
+    # Empty <pdd-dependency></pdd-dependency> still counts (has_dependency_tags) and clears deps.
+    should_update_deps = (
+        tags.get('has_dependency_tags', False) or bool(tags['dependencies'])
+    )
+    if should_update_deps:
+        old_deps = module_entry.get('dependencies', [])
+        # Compare as sets to detect changes (order-independent)
+        if set(old_deps) != set(tags['dependencies']):
+            changes['dependencies'] = {'old': old_deps, 'new': tags['dependencies']}
+            module_entry['dependencies'] = tags['dependencies']
+
+    # Include any parse warnings
+    if tags.get('interface_parse_error'):
+        warnings.append(tags['interface_parse_error'])
+
+    return changes, warnings
+
+
 def update_architecture_from_prompt(
     prompt_filename: str,
     prompts_dir: Path = PROMPTS_DIR,
@@ -717,11 +917,15 @@ def update_architecture_from_prompt(
     Update a single architecture.json entry from its prompt file tags.
 
     This function:
-    1. Reads the prompt file and extracts PDD metadata tags
+    1. Reads the prompt file and extracts PDD metadata tags (cached while
+       the file's mtime and size are unchanged); returns early without
+       loading architecture.json if neither file changed since the last
+       call found nothing to update
     2. Loads architecture.json and finds the matching module entry
     3. Updates only fields that have tags present (lenient)
     4. Tracks changes for diff display
-    5. Writes back to architecture.json (unless dry_run=True)
+    5. Writes back to architecture.json (unless dry_run=True); the write is
+       atomic and skipped when the file already holds the same JSON
 
     Args:
         prompt_filename: Name of prompt file (e.g., "llm_invoke_python.prompt")
@@ -764,23 +968,16 @@ def update_architecture_from_prompt(
                     'changes': {},
                     'error': f'Architecture file not found: {architecture_path}'
                 }
-            raw_rename = json.loads(architecture_path.read_text(encoding='utf-8'))
+            raw_rename = _load_architecture_json(architecture_path)
             arch_data_for_rename = extract_modules(raw_rename)
             for mod in arch_data_for_rename:
                 if mod.get('filename') == prompt_filename:
-                    old_filepath = mod.get('filepath', '')
-                    if old_filepath == f'prompts/{prompt_filename}':
-                        mod['filepath'] = f'prompts/{new_filename}'
-                    mod['filename'] = new_filename
+                    _rename_entry(mod, prompt_filename, new_filename)
                     if not dry_run:
-                        if isinstance(raw_rename, dict) and isinstance(raw_rename.get("modules"), list):
-                            raw_rename["modules"] = arch_data_for_rename
-                            rename_write = raw_rename
-                        else:
-                            rename_write = arch_data_for_rename
-                        architecture_path.write_text(
-                            json.dumps(rename_write, indent=2, ensure_ascii=False) + '\n',
-                            encoding='utf-8'
+                        atomic_write_json(
+                            architecture_path,
+                            _with_modules(raw_rename, arch_data_for_rename),
+                            skip_unchanged=True,
                         )
                     prompt_filename = new_filename
                     prompt_path = renamed_path
@@ -795,10 +992,25 @@ def update_architecture_from_prompt(
                     'error': f'Prompt file not found: {prompt_filename}'
                 }
 
-        prompt_content = prompt_path.read_text(encoding='utf-8')
+        # Skip the architecture.json load when neither file changed since
+        # this update last found nothing to do.
+        noop_key = None
+        if preloaded_arch_data is None and architecture_path.exists():
+            noop_key = (prompt_path.resolve(), architecture_path.resolve(), prompt_filename)
+            noop_started = read_started_ns()
+            signatures = (file_signature(noop_key[0]), file_signature(noop_key[1]))
+            cached_warnings = _NOOP_CACHE.get(noop_key, signatures)
+            if cached_warnings is not None:
+                return {
+                    'success': True,
+                    'updated': False,
+                    'changes': {},
+                    'error': None,
+                    'warnings': list(cached_warnings)
+                }
 
         # 2. Extract tags
-        tags = parse_prompt_tags(prompt_content)
+        tags = _read_prompt_tags(prompt_path)
 
         # 3. Load architecture.json (reuse preloaded data if available from rename step)
         if preloaded_arch_data is not None:
@@ -811,7 +1023,7 @@ def update_architecture_from_prompt(
                     'changes': {},
                     'error': f'Architecture file not found: {architecture_path}'
                 }
-            arch_data = extract_modules(json.loads(architecture_path.read_text(encoding='utf-8')))
+            arch_data = extract_modules(_load_architecture_json(architecture_path))
 
         # 4. Find matching module by filename
         module_entry = None
@@ -830,65 +1042,21 @@ def update_architecture_from_prompt(
                 'error': f'No architecture entry found for: {prompt_filename}'
             }
 
-        # 5. Track changes (only update fields with tags present - lenient)
-        changes = {}
-        updated = False
-        warnings = []
-
-        # Update reason if tag present
-        if tags['reason'] is not None:
-            old_reason = module_entry.get('reason')
-            if old_reason != tags['reason']:
-                changes['reason'] = {'old': old_reason, 'new': tags['reason']}
-                module_entry['reason'] = tags['reason']
-                updated = True
-
-        # Update interface if tag present
-        if tags['interface'] is not None:
-            old_interface = module_entry.get('interface')
-            merged_interface, merge_warnings = _merge_interface_signatures(
-                old_interface,
-                tags['interface'],
-            )
-            warnings.extend(merge_warnings)
-            if old_interface != merged_interface:
-                changes['interface'] = {'old': old_interface, 'new': merged_interface}
-                module_entry['interface'] = merged_interface
-                updated = True
-
-        # Update dependencies only when <pdd-dependency> metadata is present in the prompt.
-        # Reason/interface-only updates must not clear architecture.json dependencies (those may
-        # still reflect include-based or manually curated edges).
-        # Empty <pdd-dependency></pdd-dependency> still counts (has_dependency_tags) and clears deps.
-        should_update_deps = (
-            tags.get('has_dependency_tags', False) or bool(tags['dependencies'])
-        )
-        if should_update_deps:
-            old_deps = module_entry.get('dependencies', [])
-            # Compare as sets to detect changes (order-independent)
-            if set(old_deps) != set(tags['dependencies']):
-                changes['dependencies'] = {'old': old_deps, 'new': tags['dependencies']}
-                module_entry['dependencies'] = tags['dependencies']
-                updated = True
+        # 5. Apply tags (only fields with tags present - lenient)
+        changes, warnings = _apply_prompt_tags(module_entry, tags)
+        updated = bool(changes)
+
+        if not updated and noop_key is not None:
+            _NOOP_CACHE.put(noop_key, signatures, list(warnings), noop_started)
 
         # 6. Write back to architecture.json (if updated and not dry run)
         if updated and not dry_run:
             arch_data[module_index] = module_entry
-            raw_on_disk = json.loads(architecture_path.read_text(encoding='utf-8'))
-            if isinstance(raw_on_disk, dict) and isinstance(raw_on_disk.get("modules"), list):
-                raw_on_disk["modules"] = arch_data
-                write_data = raw_on_disk
-            else:
-                write_data = arch_data
-            architecture_path.write_text(
-                json.dumps(write_data, indent=2, ensure_ascii=False) + '\n',
-                encoding='utf-8'
+            raw_on_disk = _load_architecture_json(architecture_path)
+            atomic_write_json(
+                architecture_path, _with_modules(raw_on_disk, arch_data), skip_unchanged=True
             )
 
-        # Include any parse warnings
-        if tags.get('interface_parse_error'):
-            warnings.append(tags['interface_parse_error'])
-
         return {
             'success': True,
             'updated': updated,
@@ -906,6 +1074,59 @@ def update_architecture_from_prompt(
         }
 
 
+def _sync_entry_from_prompt(
+    module_entry: Dict[str, Any],
+    prompt_filename: str,
+    prompts_dir: Path,
+) -> Tuple[Dict[str, Any], Optional[Dict[str, Any]]]:
+    """
+    In-memory counterpart of update_architecture_from_prompt for batch syncs.
+
+    Works on a copy of module_entry so a failure part-way leaves the original
+    untouched.
+
+    Returns:
+        (result, new_entry) where result has the same keys as
+        update_architecture_from_prompt's result, and new_entry is the updated
+        entry when it differs from module_entry (renamed or tags changed),
+        otherwise None.
+    """
+    try:
+        entry = copy.deepcopy(module_entry)
+        prompt_path = prompts_dir / prompt_filename
+        renamed = False
+        if not prompt_path.exists():
+            renamed_path = _find_renamed_prompt_file(prompt_filename, prompts_dir)
+            if renamed_path is None:
+                return {
+                    'success': False,
+                    'updated': False,
+                    'changes': {},
+                    'error': f'Prompt file not found: {prompt_filename}'
+                }, None
+            _rename_entry(entry, prompt_filename, renamed_path.relative_to(prompts_dir).as_posix())
+            prompt_path = renamed_path
+            renamed = True
+
+        changes, warnings = _apply_prompt_tags(entry, _read_prompt_tags(prompt_path))
+        result = {
+            'success': True,
+            'updated': bool(changes),
+            'changes': changes,
+            'error': None,
+            'warnings': warnings
+        }
+        return result, entry if renamed or changes else None
+
+    except Exception as e:
+        return {
+            'success': False,
+            'updated': False,
+            'changes': {},
+            'error': f'Unexpected error: {str(e)}'
+        }, None
+
+
 def sync_all_prompts_to_architecture(
     prompts_dir: Path = PROMPTS_DIR,
     architecture_path: Path = ARCHITECTURE_JSON_PATH,
@@ -915,7 +1136,8 @@ def sync_all_prompts_to_architecture(
     Sync ALL prompt files to architecture.json.
 
     Iterates through all modules in architecture.json and updates each from
-    its corresponding prompt file (if it exists and has tags).
+    its corresponding prompt file (if it exists and has tags). The file is
+    loaded once and written at most once, with module order preserved.
 
     Args:
         prompts_dir: Directory containing prompt files
@@ -949,14 +1171,18 @@ def sync_all_prompts_to_architecture(
             'registered': reg_result['registered'],
         }
 
-    arch_data = extract_modules(json.loads(architecture_path.read_text(encoding='utf-8')))
+    raw_arch = _load_architecture_json(architecture_path)
+    arch_data = extract_modules(raw_arch)
 
     results = []
     errors = []
     updated_count = 0
     skipped_count = 0
+    modified = False
 
-    for module in arch_data:
+    # Apply every prompt to the in-memory entries, then write architecture.json
+    # once, rather than re-loading and re-writing it for each module.
+    for index, module in enumerate(arch_data):
         filename = module.get('filename')
 
         # Skip entries without filename or non-prompt files
@@ -965,12 +1191,10 @@ def sync_all_prompts_to_architecture(
             continue
 
         # Update from prompt
-        result = update_architecture_from_prompt(
-            filename,
-            prompts_dir,
-            architecture_path,
-            dry_run
-        )
+        result, new_entry = _sync_entry_from_prompt(module, filename, prompts_dir)
+        if new_entry is not None:
+            arch_data[index] = new_entry
+            modified = True
 
         # Track statistics
         if result['success'] and result['updated']:
@@ -987,6 +1211,21 @@ def sync_all_prompts_to_architecture(
             'error': result.get('error')
         })
 
+    if modified and not dry_run:
+        try:
+            atomic_write_json(
+                architecture_path, _with_modules(raw_arch, arch_data), skip_unchanged=True
+            )
+        except Exception as e:
+            # Nothing was saved: report each module whose update was lost, as
+            # the per-module write used to.
+            error = f'Unexpected error: {str(e)}'
+            for entry in results:
+                if entry['updated']:
+                    entry.update(success=False, updated=False, changes={}, error=error)
+                    errors.append(f"{entry['filename']}: {error}")
+            updated_count = 0
+
     return {
         'success': len(errors) == 0,
         'updated_count': updated_count,
@@ -1380,7 +1619,7 @@ def get_architecture_entry_for_prompt(
     if not architecture_path.exists():
         return None
 
-    arch_data = extract_modules(json.loads(architecture_path.read_text(encoding='utf-8')))
+    arch_data = extract_modules(_load_architecture_json(architecture_path))
 
     # Normalize to forward-slash path for comparison (Issue #617: filename may include subdirs)
     normalized = Path(prompt_filename).as_posix()
@@ -0,0 +1,68 @@
+"""Bounded in-process caches keyed on files' (mtime_ns, size) signatures."""
+from __future__ import annotations
+
+import os
+import time
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+Signature = Tuple[int, int]
+
+# Filesystem timestamps are coarser than the wall clock (a jiffy on Linux,
+# up to two seconds on FAT). A file modified this close to being read can be
+# rewritten within the same tick keeping its mtime and size, so such a
+# "racily clean" signature never proves the content unchanged (as in git's
+# index).
+RACY_WINDOW_NS = 2_000_000_000
+
+
+def file_signature(path: os.PathLike | str) -> Signature:
+    """Return a file's (mtime_ns, size), used to tell whether it changed."""
+    stat = os.stat(path)
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def read_started_ns() -> int:
+    """Timestamp to take before reading the files a cache entry is built from."""
+    return time.time_ns()
+
+
+class FileSignatureCache:
+    """Map keys to values that stay valid while their files' signatures hold.
+
+    An entry's signature is a tuple of file signatures, one per file the value
+    was derived from. Entries whose files were modified within RACY_WINDOW_NS
+    of being read are not stored, and the oldest entry is evicted once
+    ``maxsize`` entries are held.
+    """
+
+    def __init__(self, maxsize: int = 256) -> None:
+        self.maxsize = maxsize
+        self._entries: Dict[Hashable, Tuple[Tuple[Signature, ...], Any]] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable, signature: Tuple[Signature, ...]) -> Optional[Any]:
+        """Return the value cached for key if its signature still matches, else None."""
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] == signature:
+            return entry[1]
+        return None
+
+    def put(
+        self,
+        key: Hashable,
+        signature: Tuple[Signature, ...],
+        value: Any,
+        read_started: int,
+    ) -> None:
+        """Cache value for key unless a file changed too close to ``read_started``."""
+        self._entries.pop(key, None)
+        if any(mtime_ns >= read_started - RACY_WINDOW_NS for mtime_ns, _ in signature):
+            return
+        if len(self._entries) >= self.maxsize:
+            del self._entries[next(iter(self._entries))]
+        self._entries[key] = (signature, value)
+
+    def clear(self) -> None:
+        self._entries.clear()
@@ -3,14 +3,43 @@ from __future__ import annotations
 
 import json
 import os
+import shutil
 import tempfile
 from pathlib import Path
 from typing import Any
 
 
-def atomic_write_json(path: Path, data: Any, *, indent: int = 2) -> None:
-    """Write JSON to ``path`` via a temp file in the same directory and ``os.replace``."""
+def _match_target_mode(tmp: str, path: Path) -> None:
+    """Give the temp file the mode a plain write to ``path`` would leave.
+
+    mkstemp creates files as 0600, so without this every rewrite would
+    tighten the target's permissions.
+    """
+    if path.exists():
+        shutil.copymode(path, tmp)
+        return
+    umask = os.umask(0)
+    os.umask(umask)
+    os.chmod(tmp, 0o666 & ~umask)
+
+
+def atomic_write_json(
+    path: Path, data: Any, *, indent: int = 2, skip_unchanged: bool = False
+) -> bool:
+    """Write JSON to ``path`` via a temp file in the same directory and ``os.replace``.
+
+    With ``skip_unchanged``, the file is left untouched (no temp file, no
+    fsync, mtime preserved) when it already holds exactly the serialized
+    text. Returns True if the file was written.
+    """
     path = path.resolve()
+    text = json.dumps(data, indent=indent, ensure_ascii=False) + "\n"
+    if skip_unchanged:
+        try:
+            if path.read_text(encoding="utf-8") == text:
+                return False
+        except (OSError, UnicodeDecodeError):
+            pass
     path.parent.mkdir(parents=True, exist_ok=True)
     fd, tmp = tempfile.mkstemp(
         dir=str(path.parent),
@@ -19,10 +48,10 @@ def atomic_write_json(path: Path, data: Any, *, indent: int = 2) -> None:
     )
     try:
         with os.fdopen(fd, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=indent, ensure_ascii=False)
-            f.write("\n")
+            f.write(text)
             f.flush()
             os.fsync(f.fileno())
+        _match_target_mode(tmp, path)
         os.replace(tmp, path)
     except BaseException:
         try:
@@ -30,3 +59,4 @@ def atomic_write_json(path: Path, data: Any, *, indent: int = 2) -> None:
         except OSError:
             pass
         raise
+    return True
@@ -1,12 +1,21 @@
 from pathlib import Path
 from typing import Optional
 from rich import print
+from pdd.file_signature_cache import FileSignatureCache, file_signature, read_started_ns
 from pdd.path_resolution import get_default_resolver
 
+# Loaded templates keyed by resolved path. An entry is reused only while the
+# file's (mtime_ns, size) signature is unchanged.
+_TEMPLATE_CACHE = FileSignatureCache(maxsize=256)
+
 def print_formatted(message: str) -> None:
     """Print message with raw formatting tags for testing compatibility."""
     print(message)
 
+def clear_prompt_template_cache() -> None:
+    """Drop all cached prompt templates so the next load re-reads from disk."""
+    _TEMPLATE_CACHE.clear()
+
 def load_prompt_template(prompt_name: str) -> Optional[str]:
     """
     Load a prompt template from a file.
@@ -16,6 +25,11 @@ def load_prompt_template(prompt_name: str) -> Optional[str]:
 
     Returns:
         str: The prompt template text
+
+    Templates are cached per resolved path and re-read when the file changes
+    (files modified within the last couple of seconds are always re-read);
+    the "Successfully loaded" message is printed only on an actual read.
+    Call clear_prompt_template_cache() to force a reload.
     """
     # Type checking
     if not isinstance(prompt_name, str):
@@ -44,10 +58,22 @@ def load_prompt_template(prompt_name: str) -> Optional[str]:
         )
         return None
 
+    started = read_started_ns()
+    try:
+        signature = (file_signature(prompt_path),)
+    except OSError:
+        signature = None
+    if signature is not None:
+        cached = _TEMPLATE_CACHE.get(prompt_path, signature)
+        if cached is not None:
+            return cached
+
     try:
         with open(prompt_path, 'r', encoding='utf-8') as file:
             prompt_template = file.read()
             print_formatted(f"[green]Successfully loaded prompt: {prompt_name}[/green]")
+            if signature is not None:
+                _TEMPLATE_CACHE.put(prompt_path, signature, prompt_template, started)
             return prompt_template
 
     except IOError as e:
@@ -194,8 +194,13 @@ def process_backtick_includes(text: str, recursive: bool, _seen: Optional[set] =
             with open(full_path, 'r', encoding='utf-8') as file:
                 content = file.read()
                 if recursive:
-                    child_seen = _seen | {resolved}
-                    content = preprocess(content, recursive=True, double_curly_brackets=False, _seen=child_seen)
+                    # _seen holds the current include chain: push this file for the
+                    # nested pass and pop it afterwards instead of copying the set.
+                    _seen.add(resolved)
+                    try:
+                        content = preprocess(content, recursive=True, double_curly_brackets=False, _seen=_seen)
+                    finally:
+                        _seen.discard(resolved)
                 _dbg(f"Included via backticks: {file_path} (len={len(content)})")
                 return f"```{content}```"
         except FileNotFoundError:
@@ -403,8 +408,11 @@ def process_include_tags(text: str, recursive: bool, _seen: Optional[set] = None
                             console.print(f"[yellow]Warning: ContentSelector failed for select=\"{selectors_str}\" on {full_path}: {e}. Including full content.[/yellow]")
                     
                     if recursive:
-                        child_seen = _seen | {resolved}
-                        content = preprocess(content, recursive=True, double_curly_brackets=False, _seen=child_seen)
+                        _seen.add(resolved)
+                        try:
+                            content = preprocess(content, recursive=True, double_curly_brackets=False, _seen=_seen)
+                        finally:
+                            _seen.discard(resolved)
                     _dbg(f"Included via XML tag: {file_path} (len={len(content)})")
                     return content
         except FileNotFoundError:
@@ -34,7 +34,6 @@ setup(
         "jsonschema==4.23.0",
         "keyring==25.6.0",
         "litellm[caching]>=1.80.0",
-        "lxml>=5.0.0",
         "nest_asyncio==1.6.0",
         "openai>=1.99.5",
         "pandas==2.2.3",
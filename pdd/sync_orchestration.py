@@ -87,20 +87,22 @@ def _run_fix_operation_test_subprocess(*args: Any, **kwargs: Any) -> Any:
 # Note: _safe_basename is imported from sync_determine_operation
 
 
+# Index of the cost and model fields in each operation's result tuple:
+# - crash/fix/verify: 6-tuple (..., cost, model) — cost at 4, model at 5
+# - generate: 4-tuple (content, was_incremental, cost, model) — cost at 2, model at 3
+# - example/test/test_extend/auto-deps and anything else: 3-or-4-tuple
+#   (..., cost, model, ...) — cost at 1, model at 2 (the .get() defaults)
+_COST_IDX = {'crash': 4, 'fix': 4, 'verify': 4, 'generate': 2}
+_MODEL_IDX = {'crash': 5, 'fix': 5, 'verify': 5, 'generate': 3}
+
+
 def _extract_cost_from_result(operation: str, result: tuple) -> float:
     """Extract cost from an operation result tuple at the correct index.
 
-    Each operation returns a different tuple format:
-    - crash/fix/verify: 6-tuple (..., cost, model) — cost at index 4
-    - generate: 4-tuple (content, was_incremental, cost, model) — cost at index 2
-    - example/test/test_extend/auto-deps: 3-or-4-tuple (..., cost, model, ...) — cost at index 1
+    The index comes from ``_COST_IDX``; operations not listed there keep cost
+    at index 1.
     """
-    if operation in ('crash', 'fix', 'verify'):
-        idx = 4
-    elif operation == 'generate':
-        idx = 2
-    else:
-        idx = 1
+    idx = _COST_IDX.get(operation, 1)
     if len(result) > idx:
         val = result[idx]
         if isinstance(val, (int, float)) and not isinstance(val, bool):
@@ -111,17 +113,10 @@ def _extract_cost_from_result(operation: str, result: tuple) -> float:
 def _extract_model_from_result(operation: str, result: tuple) -> str:
     """Extract model name from an operation result tuple at the correct index.
 
-    Each operation returns a different tuple format:
-    - crash/fix/verify: 6-tuple (..., cost, model) — model at index 5
-    - generate: 4-tuple (content, was_incremental, cost, model) — model at index 3
-    - example/test/test_extend/auto-deps: 3-or-4-tuple (..., cost, model, ...) — model at index 2
+    The index comes from ``_MODEL_IDX``; operations not listed there keep the
+    model at index 2.
     """
-    if operation in ('crash', 'fix', 'verify'):
-        idx = 5
-    elif operation == 'generate':
-        idx = 3
-    else:
-        idx = 2
+    idx = _MODEL_IDX.get(operation, 2)
     if len(result) > idx and isinstance(result[idx], str):
         return result[idx]
     return 'unknown'
@@ -28,6 +28,11 @@ import re
 import os
 from typing import Dict, Any
 
+# Matches every supported {placeholder} in one scan of the template.
+_PLACEHOLDER_PATTERN = re.compile(
+    r"\{(name|category|dir_prefix|ext|language|name_snake|name_pascal|name_kebab)\}"
+)
+
 
 def _to_snake_case(s: str) -> str:
     """
@@ -150,10 +155,10 @@ def expand_template(template: str, context: Dict[str, Any]) -> str:
         'name_kebab': _to_kebab_case(name),
     }
 
-    # Perform substitution
-    result = template
-    for key, value in placeholders.items():
-        result = result.replace(f'{{{key}}}', str(value))
+    # Perform substitution in a single pass over the template
+    result = _PLACEHOLDER_PATTERN.sub(
+        lambda match: str(placeholders[match.group(1)]), template
+    )
 
     # Normalize the path to handle empty segments (double slashes)
     result = _normalize_path(result)
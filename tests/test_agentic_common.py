@@ -5216,3 +5216,66 @@ class TestDetectControlTokenLineEndings:
             "index 1 — it is outside the 30-line tail. But .split('\\n') treats "
             "the entire \\r-separated text as one line, bypassing tail restriction"
         )
+
+
+class TestSubstituteTemplateVariables:
+    """substitute_template_variables replaces known placeholders in one pass."""
+
+    def test_values_with_braces_are_inserted_verbatim(self):
+        from pdd.agentic_common import substitute_template_variables
+        json_value = '{"error": "Insufficient role"}'
+        result = substitute_template_variables(
+            "Finding: {step1_output} for #{issue_number}",
+            {"step1_output": json_value, "issue_number": 549},
+        )
+        assert result == f"Finding: {json_value} for #549"
+
+    def test_placeholders_inside_values_are_not_expanded(self):
+        from pdd.agentic_common import substitute_template_variables
+        result = substitute_template_variables(
+            "{a} {b}", {"a": "{b}", "b": "B"}
+        )
+        assert result == "{b} B"
+
+    def test_unknown_placeholders_left_intact(self):
+        from pdd.agentic_common import substitute_template_variables
+        assert substitute_template_variables("{known} {unknown}", {"known": 1}) == "1 {unknown}"
+        assert substitute_template_variables("{unknown}", {}) == "{unknown}"
+
+    def test_many_keys_with_shared_prefixes(self):
+        from pdd.agentic_common import substitute_template_variables
+        context = {f"step{i}_output": f"<{i}>" for i in range(1, 13)}
+        context["step5.5_output"] = "<5.5>"
+        template = " ".join("{" + key + "}" for key in reversed(list(context)))
+        result = substitute_template_variables(template, context)
+        assert result == " ".join(reversed(list(context.values())))
+
+    def test_template_compiled_once(self):
+        from pdd.agentic_common import _compile_template, substitute_template_variables
+        _compile_template.cache_clear()
+        template = "Step: {step1_output} / {step2_output}"
+        substitute_template_variables(template, {"step1_output": "one"})
+        result = substitute_template_variables(
+            template, {"step1_output": "one", "step2_output": "two"}
+        )
+        assert result == "Step: one / two"
+        info = _compile_template.cache_info()
+        assert info.misses == 1
+        assert info.hits == 1
+
+    def test_oversized_template_not_cached(self):
+        from pdd.agentic_common import (
+            _MAX_CACHED_TEMPLATE_CHARS,
+            _compile_template,
+            substitute_template_variables,
+        )
+        _compile_template.cache_clear()
+        template = "x" * _MAX_CACHED_TEMPLATE_CHARS + " {step1_output}"
+        result = substitute_template_variables(template, {"step1_output": "one"})
+        assert result.endswith(" one")
+        assert _compile_template.cache_info().currsize == 0
+
+    def test_template_without_placeholders_returned_unchanged(self):
+        from pdd.agentic_common import substitute_template_variables
+        template = "Plain prompt without slots."
+        assert substitute_template_variables(template, {"x": 1}) == template
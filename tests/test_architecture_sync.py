@@ -5,6 +5,7 @@ Tests bidirectional sync between architecture.json and prompt file metadata tags
 """
 
 import json
+import os
 import tempfile
 from pathlib import Path
 
@@ -14,6 +15,7 @@ from pdd.architecture_sync import (
     _find_renamed_prompt_file,
     _infer_filepath,
     _infer_module_tags,
+    clear_prompt_tags_cache,
     filepath_to_prompt_filename,
     generate_tags_from_architecture,
     get_architecture_entry_for_prompt,
@@ -30,6 +32,20 @@ from pdd.architecture_sync import (
 )
 
 
+@pytest.fixture(autouse=True)
+def _fresh_prompt_tags_cache():
+    """Keep cached prompt tags from leaking between tests."""
+    clear_prompt_tags_cache()
+    yield
+    clear_prompt_tags_cache()
+
+
+def _backdate(path, seconds=60):
+    """Move a file's mtime into the past so its signature is cacheable."""
+    mtime_ns = path.stat().st_mtime_ns - seconds * 10**9
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
 # --- Test parse_prompt_tags ---
 
 def test_parse_tags_with_all_fields():
@@ -108,6 +124,104 @@ def test_parse_tags_malformed_xml():
     assert result['dependencies'] == []
 
 
+def test_parse_tags_self_closing_dependency_counts_as_tag():
+    """<pdd-dependency/> declares an empty dependency set, so it must clear deps."""
+    result = parse_prompt_tags("<pdd-reason>R</pdd-reason>\n<pdd-dependency/>\n")
+
+    assert result['reason'] == 'R'
+    assert result['has_dependency_tags'] is True
+    assert result['dependencies'] == []
+
+
+def test_parse_tags_with_attributes():
+    """Tags carrying attributes are still recognized."""
+    content = (
+        '<pdd-reason lang="en">Attributed reason</pdd-reason>\n'
+        '<pdd-dependency kind="runtime">a_python.prompt</pdd-dependency>\n'
+        '<pdd-dependency kind="none" />\n'
+    )
+
+    result = parse_prompt_tags(content)
+
+    assert result['reason'] == 'Attributed reason'
+    assert result['dependencies'] == ['a_python.prompt']
+    assert result['has_dependency_tags'] is True
+
+
+def test_parse_tags_decodes_numeric_character_references():
+    """Numeric and named character references are decoded like an XML parser would."""
+    content = (
+        '<pdd-reason>Handles &#60;input&#x3E; &amp; &quot;output&quot;</pdd-reason>\n'
+        '<pdd-interface>&#123;"type": "module"&#125;</pdd-interface>\n'
+    )
+
+    result = parse_prompt_tags(content)
+
+    assert result['reason'] == 'Handles <input> & "output"'
+    assert result['interface'] == {'type': 'module'}
+
+
+def test_parse_tags_text_stops_at_child_markup():
+    """Like element.text, a tag's text ends at its first child element; comments are dropped."""
+    content = (
+        '<pdd-reason>Leading text <b>bold</b> trailing</pdd-reason>\n'
+        '<pdd-dependency>a_python.prompt<!-- note --></pdd-dependency>\n'
+    )
+
+    result = parse_prompt_tags(content)
+
+    assert result['reason'] == 'Leading text'
+    assert result['dependencies'] == ['a_python.prompt']
+
+
+def test_parse_tags_body_starting_with_child_has_no_text():
+    """A reason whose body starts with a child element has no text, as with lxml."""
+    result = parse_prompt_tags("<pdd-reason><b>bold</b></pdd-reason>\n")
+
+    assert result['reason'] is None
+
+
+def test_parse_tags_ignores_commented_out_tags():
+    """Tags inside an XML comment are not real tags."""
+    content = (
+        '<pdd-reason>R</pdd-reason>\n'
+        '<!-- <pdd-dependency>old_python.prompt</pdd-dependency> -->\n'
+        '<!--\n<pdd-interface>{"type": "old"}</pdd-interface>\n-->\n'
+        '<pdd-dependency>a_python.prompt</pdd-dependency>\n'
+    )
+
+    result = parse_prompt_tags(content)
+
+    assert result['reason'] == 'R'
+    assert result['dependencies'] == ['a_python.prompt']
+    assert result['interface'] is None
+
+
+def test_parse_tags_unwraps_cdata_interface():
+    """A CDATA-wrapped interface is parsed as JSON, with its content kept literal."""
+    content = (
+        '<pdd-reason>R</pdd-reason>\n'
+        '<pdd-interface><![CDATA[{"type": "module", "note": "a < b &amp; c"}]]></pdd-interface>\n'
+    )
+
+    result = parse_prompt_tags(content)
+
+    assert result['interface'] == {'type': 'module', 'note': 'a < b &amp; c'}
+
+
+def test_parse_tags_mismatched_closing_tag_ends_text():
+    """A mismatched closing tag ends the text instead of being captured in it."""
+    content = (
+        '<pdd-reason>Mismatched reason</pdd-dependency>\n'
+        '<pdd-dependency>a_python.prompt</pdd-dependency>\n'
+    )
+
+    result = parse_prompt_tags(content)
+
+    assert result['reason'] == 'Mismatched reason'
+    assert result['dependencies'] == ['a_python.prompt']
+
+
 def test_parse_tags_invalid_json_in_interface():
     """Test lenient parsing with invalid JSON in interface tag."""
     content = """
@@ -611,6 +725,7 @@ def test_parse_tags_no_pdd_tags():
     assert result['reason'] is None
     assert result['interface'] is None
     assert result['dependencies'] == []
+    assert result['has_dependency_tags'] is False
 
 
 # --- Test update_architecture_from_prompt ---
@@ -727,6 +842,141 @@ def test_update_architecture_from_prompt_missing_file():
         assert 'not found' in result['error'].lower()
 
 
+def test_update_architecture_from_prompt_reparses_only_changed_prompt(tmp_path, monkeypatch):
+    """Unchanged prompts reuse cached tags; an edited prompt is parsed again."""
+    from pdd import architecture_sync
+
+    prompts_dir = tmp_path / "prompts"
+    prompts_dir.mkdir()
+    prompt = prompts_dir / "cache_python.prompt"
+    prompt.write_text("<pdd-reason>First</pdd-reason>\n", encoding="utf-8")
+    _backdate(prompt)
+    arch_file = tmp_path / "architecture.json"
+    arch_file.write_text(json.dumps([{"filename": "cache_python.prompt", "reason": "Old"}]))
+
+    parse_calls = []
+    real_parse = architecture_sync._tags_from_header
+    monkeypatch.setattr(
+        architecture_sync,
+        "_tags_from_header",
+        lambda header: parse_calls.append(header) or real_parse(header),
+    )
+
+    def sync():
+        return update_architecture_from_prompt(
+            "cache_python.prompt", prompts_dir=prompts_dir, architecture_path=arch_file, dry_run=True
+        )
+
+    assert sync()["changes"]["reason"]["new"] == "First"
+    assert sync()["changes"]["reason"]["new"] == "First"
+    assert len(parse_calls) == 1
+
+    prompt.write_text("<pdd-reason>Second edit</pdd-reason>\n", encoding="utf-8")
+    assert sync()["changes"]["reason"]["new"] == "Second edit"
+    assert len(parse_calls) == 2
+
+
+def test_update_architecture_from_prompt_reparses_same_size_edit_within_one_tick(tmp_path):
+    """A same-size rewrite that keeps the mtime of a just-modified prompt is not served stale."""
+    prompts_dir = tmp_path / "prompts"
+    prompts_dir.mkdir()
+    prompt = prompts_dir / "racy_python.prompt"
+    prompt.write_text("<pdd-reason>AAAA</pdd-reason>\n", encoding="utf-8")
+    arch_file = tmp_path / "architecture.json"
+    arch_file.write_text(json.dumps([{"filename": "racy_python.prompt", "reason": "Old"}]))
+
+    def sync():
+        return update_architecture_from_prompt(
+            "racy_python.prompt", prompts_dir=prompts_dir, architecture_path=arch_file, dry_run=True
+        )
+
+    assert sync()["changes"]["reason"]["new"] == "AAAA"
+
+    # Same size, same mtime: what a second write within one timestamp tick looks like.
+    stat = prompt.stat()
+    prompt.write_text("<pdd-reason>BBBB</pdd-reason>\n", encoding="utf-8")
+    os.utime(prompt, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+    assert sync()["changes"]["reason"]["new"] == "BBBB"
+
+
+def test_update_architecture_from_prompt_skips_load_while_noop_inputs_unchanged(tmp_path, monkeypatch):
+    """A repeated no-op update does not reload architecture.json until a file changes."""
+    from pdd import architecture_sync
+
+    prompts_dir = tmp_path / "prompts"
+    prompts_dir.mkdir()
+    (prompts_dir / "noop_python.prompt").write_text("<pdd-reason>Current</pdd-reason>\n", encoding="utf-8")
+    arch_file = tmp_path / "architecture.json"
+    arch_file.write_text(json.dumps([{"filename": "noop_python.prompt", "reason": "Current"}]))
+    _backdate(prompts_dir / "noop_python.prompt")
+    _backdate(arch_file)
+
+    loads = []
+    real_load = architecture_sync._load_architecture_json
+    monkeypatch.setattr(
+        architecture_sync,
+        "_load_architecture_json",
+        lambda path: loads.append(path) or real_load(path),
+    )
+
+    def sync():
+        return update_architecture_from_prompt(
+            "noop_python.prompt", prompts_dir=prompts_dir, architecture_path=arch_file
+        )
+
+    assert sync()["updated"] is False
+    assert sync() == {"success": True, "updated": False, "changes": {}, "error": None, "warnings": []}
+    assert len(loads) == 1
+
+    arch_file.write_text(json.dumps([{"filename": "noop_python.prompt", "reason": "Edited by hand"}]))
+    result = sync()
+    assert result["changes"]["reason"] == {"old": "Edited by hand", "new": "Current"}
+    assert json.loads(arch_file.read_text())[0]["reason"] == "Current"
+
+
+def test_update_architecture_from_prompt_applies_same_size_architecture_edit_within_one_tick(tmp_path):
+    """A same-size hand edit that keeps architecture.json's fresh mtime is not taken for a no-op."""
+    prompts_dir = tmp_path / "prompts"
+    prompts_dir.mkdir()
+    (prompts_dir / "racy_python.prompt").write_text(
+        "<pdd-dependency>aaaa_python.prompt</pdd-dependency>\n", encoding="utf-8"
+    )
+    arch_file = tmp_path / "architecture.json"
+    arch_file.write_text(json.dumps([{"filename": "racy_python.prompt", "dependencies": ["aaaa_python.prompt"]}]))
+
+    def sync():
+        return update_architecture_from_prompt(
+            "racy_python.prompt", prompts_dir=prompts_dir, architecture_path=arch_file
+        )
+
+    assert sync()["updated"] is False
+
+    # Flip one dependency name: same size, same mtime, as within one timestamp tick.
+    stat = arch_file.stat()
+    arch_file.write_text(json.dumps([{"filename": "racy_python.prompt", "dependencies": ["bbbb_python.prompt"]}]))
+    os.utime(arch_file, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+    assert sync()["updated"] is True
+    assert json.loads(arch_file.read_text())[0]["dependencies"] == ["aaaa_python.prompt"]
+
+
+@pytest.mark.parametrize("use_orjson", [True, False], ids=["orjson", "stdlib"])
+def test_get_architecture_entry_same_with_or_without_orjson(tmp_path, monkeypatch, use_orjson):
+    """orjson is optional; the stdlib fallback must load architecture.json identically."""
+    from pdd import architecture_sync
+
+    if use_orjson:
+        pytest.importorskip("orjson")
+    else:
+        monkeypatch.setattr(architecture_sync, "orjson", None)
+    arch_file = tmp_path / "architecture.json"
+    entry = {"filename": "café_python.prompt", "reason": "Ünïcode", "priority": 3}
+    arch_file.write_text(json.dumps({"modules": [entry]}, ensure_ascii=False), encoding="utf-8")
+
+    assert get_architecture_entry_for_prompt("café_python.prompt", architecture_path=arch_file) == entry
+
+
 def test_update_architecture_from_prompt_no_entry():
     """Test error when no architecture entry exists for prompt."""
     with tempfile.TemporaryDirectory() as tmpdir:
@@ -828,6 +1078,73 @@ def test_sync_all_prompts_to_architecture():
         assert len(result['results']) == 3
 
 
+def test_sync_all_prompts_writes_architecture_once_in_original_order(tmp_path, monkeypatch):
+    """A batch sync loads and writes architecture.json once, keeping module order."""
+    from pdd import architecture_sync
+
+    prompts_dir = tmp_path / "prompts"
+    prompts_dir.mkdir()
+    (prompts_dir / "zeta.prompt").write_text("<pdd-reason>Zeta</pdd-reason>")
+    (prompts_dir / "alpha_step2_x.prompt").write_text("% No tags")
+    arch_file = tmp_path / "architecture.json"
+    arch_file.write_text(json.dumps({"modules": [
+        {"name": "zeta", "filename": "zeta.prompt", "reason": "Old", "priority": 1},
+        {"name": "alpha", "filename": "alpha_step1_x.prompt", "filepath": "prompts/alpha_step1_x.prompt",
+         "reason": "Old", "priority": 2},
+    ]}))
+
+    writes = []
+    real_write = architecture_sync.atomic_write_json
+    monkeypatch.setattr(
+        architecture_sync,
+        "atomic_write_json",
+        lambda *args, **kwargs: writes.append(args) or real_write(*args, **kwargs),
+    )
+
+    result = sync_all_prompts_to_architecture(prompts_dir=prompts_dir, architecture_path=arch_file)
+
+    assert result['success'] is True
+    assert result['updated_count'] == 1
+    assert len(writes) == 1
+    modules = json.loads(arch_file.read_text())["modules"]
+    assert [m["name"] for m in modules] == ["zeta", "alpha"]
+    assert modules[1]["filename"] == "alpha_step2_x.prompt"
+    assert modules[1]["filepath"] == "prompts/alpha_step2_x.prompt"
+    assert [m["reason"] for m in modules] == ["Zeta", "Old"]
+
+
+def test_sync_all_prompts_reports_failed_write_as_module_errors(tmp_path, monkeypatch):
+    """A failed architecture.json write comes back as errors, not an exception."""
+    from pdd import architecture_sync
+
+    prompts_dir = tmp_path / "prompts"
+    prompts_dir.mkdir()
+    (prompts_dir / "module1.prompt").write_text("<pdd-reason>Module 1</pdd-reason>")
+    (prompts_dir / "module2.prompt").write_text("% No tags")
+    arch_file = tmp_path / "architecture.json"
+    arch_file.write_text(json.dumps([
+        {"filename": "module1.prompt", "reason": "Old 1"},
+        {"filename": "module2.prompt", "reason": "Old 2"},
+    ]))
+
+    def fail_write(*args, **kwargs):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(architecture_sync, "atomic_write_json", fail_write)
+
+    result = sync_all_prompts_to_architecture(prompts_dir=prompts_dir, architecture_path=arch_file)
+
+    assert result['success'] is False
+    assert result['updated_count'] == 0
+    assert result['errors'] == ["module1.prompt: Unexpected error: disk full"]
+    failed, untouched = result['results']
+    assert failed['success'] is False
+    assert failed['updated'] is False
+    assert "disk full" in failed['error']
+    assert untouched['success'] is True
+    assert json.loads(arch_file.read_text())[0]['reason'] == "Old 1"
+
+
 # --- Test validate_dependencies ---
 
 def test_validate_dependencies_valid():
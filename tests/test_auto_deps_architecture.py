@@ -2,6 +2,7 @@
 from __future__ import annotations
 
 import json
+import os
 from pathlib import Path
 
 from pdd.json_atomic import atomic_write_json
@@ -269,6 +270,40 @@ def test_atomic_write_json_writes_parseable_file(tmp_path: Path) -> None:
     assert path.read_text(encoding="utf-8").strip().startswith("[")
 
 
+def test_atomic_write_json_skip_unchanged_leaves_identical_file_alone(tmp_path: Path) -> None:
+    path = tmp_path / "data.json"
+    assert atomic_write_json(path, [{"a": "é"}]) is True
+    before = path.stat().st_mtime_ns
+    os.utime(path, ns=(before - 10**9, before - 10**9))
+
+    assert atomic_write_json(path, [{"a": "é"}], skip_unchanged=True) is False
+    assert path.stat().st_mtime_ns == before - 10**9
+
+    assert atomic_write_json(path, [{"a": "b"}], skip_unchanged=True) is True
+    assert json.loads(path.read_text(encoding="utf-8")) == [{"a": "b"}]
+
+
+def test_atomic_write_json_keeps_file_mode(tmp_path: Path) -> None:
+    path = tmp_path / "data.json"
+    path.write_text("[]\n", encoding="utf-8")
+    os.chmod(path, 0o644)
+
+    atomic_write_json(path, [{"a": 1}])
+
+    assert path.stat().st_mode & 0o777 == 0o644
+
+
+def test_atomic_write_json_new_file_follows_umask(tmp_path: Path) -> None:
+    path = tmp_path / "data.json"
+    umask = os.umask(0o022)
+    try:
+        atomic_write_json(path, [])
+    finally:
+        os.umask(umask)
+
+    assert path.stat().st_mode & 0o777 == 0o644
+
+
 def test_merge_does_not_add_dep_without_architecture_entry_for_peer(tmp_path: Path) -> None:
     """Unknown modules (no row in architecture) are not appended as orphan filenames."""
     (tmp_path / ".git").mkdir()
@@ -10,95 +10,181 @@ commit" — leaving modified files orphaned as unstaged changes in the worktree.
 These tests exercise the full orchestrator code path with real git operations.
 Only LLM execution (run_agentic_task) and state persistence are mocked.
 _get_file_hashes and _commit_and_push run unpatched against real git repos.
+
+Because every test builds real git repositories, the module is marked slow.
 """
 
+import contextlib
+import os
+import shutil
 import subprocess
 from pathlib import Path
+from typing import Any, Dict, List, NamedTuple
 from unittest.mock import patch
 
 import pytest
 
+# Tagged slow so `-m "not slow"` can skip them locally; CI still runs them.
+pytestmark = pytest.mark.slow
+
+# Throwaway commit identity passed as ``-c`` overrides instead of persisting
+# it with separate ``git config`` calls.
+_GIT_IDENTITY = ["-c", "user.email=test@test.com", "-c", "user.name=Test"]
+
+
+@pytest.fixture(autouse=True)
+def git_identity(monkeypatch):
+    """Give the orchestrator's own ``git commit`` an author without git config."""
+    monkeypatch.setenv("GIT_AUTHOR_NAME", "Test")
+    monkeypatch.setenv("GIT_AUTHOR_EMAIL", "test@test.com")
+    monkeypatch.setenv("GIT_COMMITTER_NAME", "Test")
+    monkeypatch.setenv("GIT_COMMITTER_EMAIL", "test@test.com")
+
+
+@pytest.fixture(scope="session")
+def seed_commit(tmp_path_factory):
+    """Build the initial 'pdd/module.py' commit once per session.
+
+    Git objects are content-addressed, so every scenario can reuse the same
+    commit. Returns ``(objects_dir, sha, branch)``.
+    """
+    seed = tmp_path_factory.mktemp("issue545_seed")
+    subprocess.run(["git", "init", str(seed)], check=True, capture_output=True)
+    (seed / "pdd").mkdir()
+    (seed / "pdd" / "module.py").write_text("x = 1\n")
+    subprocess.run(["git", "add", "."],
+                   cwd=seed, check=True, capture_output=True)
+    subprocess.run(["git", *_GIT_IDENTITY, "commit", "-m", "initial commit"],
+                   cwd=seed, check=True, capture_output=True)
+    sha = subprocess.run(
+        ["git", "rev-parse", "HEAD"],
+        cwd=seed, capture_output=True, text=True, check=True
+    ).stdout.strip()
+    branch = subprocess.run(
+        ["git", "symbolic-ref", "--short", "HEAD"],
+        cwd=seed, capture_output=True, text=True, check=True
+    ).stdout.strip()
+    return seed / ".git" / "objects", sha, branch
+
+
+def _link_objects(objects_dir: Path, git_dir: Path) -> None:
+    """Hardlink the seed commit's immutable object files into ``git_dir``."""
+    shutil.copytree(objects_dir, git_dir / "objects",
+                    copy_function=os.link, dirs_exist_ok=True)
+
+
+def _seed_files(mapping: Dict[Path, bytes]) -> None:
+    """Write raw bytes to each path."""
+    for path, data in mapping.items():
+        path.write_bytes(data)
 
-def _create_git_repo_with_remote(tmp_path: Path):
-    """Create a git repo cloned from a bare remote, suitable for push testing."""
+
+def _create_git_repo_with_remote(tmp_path: Path, seed_commit, push: bool = False):
+    """Create a git repo with a bare remote, suitable for push testing.
+
+    Instead of adding and committing, the worktree and remote share the
+    session's seed objects and point their branch at the seed commit.
+    Pass ``push=True`` to also set the upstream with ``git push -u``; only
+    tests that inspect ``@{upstream}`` need it, since the orchestrator
+    pushes with ``-u`` itself.
+    """
+    objects_dir, sha, branch = seed_commit
     bare = tmp_path / "bare.git"
     worktree = tmp_path / "worktree"
 
     subprocess.run(["git", "init", "--bare", str(bare)],
                    check=True, capture_output=True)
-    subprocess.run(["git", "clone", str(bare), str(worktree)],
+    subprocess.run(["git", "init", str(worktree)],
                    check=True, capture_output=True)
-    subprocess.run(["git", "config", "user.email", "test@test.com"],
+    _link_objects(objects_dir, bare)
+    _link_objects(objects_dir, worktree / ".git")
+
+    subprocess.run(["git", "update-ref", f"refs/heads/{branch}", sha],
+                   cwd=bare, check=True, capture_output=True)
+    subprocess.run(["git", "update-ref", "HEAD", sha],
                    cwd=worktree, check=True, capture_output=True)
-    subprocess.run(["git", "config", "user.name", "Test"],
+    subprocess.run(["git", "read-tree", "--reset", "-u", "HEAD"],
                    cwd=worktree, check=True, capture_output=True)
+    subprocess.run(["git", "remote", "add", "origin", str(bare)],
+                   cwd=worktree, check=True, capture_output=True)
+    if push:
+        subprocess.run(["git", "push", "-u", "origin", branch],
+                       cwd=worktree, check=True, capture_output=True)
 
-    # Create initial committed file inside a pdd/ subdirectory
-    pdd_dir = worktree / "pdd"
-    pdd_dir.mkdir()
-    module = pdd_dir / "module.py"
-    module.write_text("x = 1\n")
+    return worktree, worktree / "pdd" / "module.py"
 
-    subprocess.run(["git", "add", "."],
-                   cwd=worktree, check=True, capture_output=True)
-    subprocess.run(["git", "commit", "-m", "initial commit"],
-                   cwd=worktree, check=True, capture_output=True)
 
-    branch = subprocess.run(
-        ["git", "rev-parse", "--abbrev-ref", "HEAD"],
-        cwd=worktree, capture_output=True, text=True, check=True
-    ).stdout.strip()
-    subprocess.run(["git", "push", "-u", "origin", branch],
-                   cwd=worktree, check=True, capture_output=True)
+def _step_side_effect(*args, **kwargs):
+    """Mock LLM: Step 2 returns ALL_TESTS_PASS, everything else passes."""
+    label = kwargs.get("label", "")
+    if "step2" in label:
+        return (True, "ALL_TESTS_PASS", 0.1, "gpt-4")
+    return (True, f"Output for {label}", 0.1, "gpt-4")
 
-    return worktree, module
 
+@pytest.fixture(autouse=True, scope="class")
+def orchestrator_mocks():
+    """Patch LLM calls, state persistence and console once per test class.
 
-def _run_orchestrator_with_all_tests_pass(worktree: Path):
+    _get_file_hashes and _commit_and_push are left unpatched so they run
+    against the real git repo.
+    """
+    target = "pdd.agentic_e2e_fix_orchestrator"
+    with contextlib.ExitStack() as stack:
+        mock_run = stack.enter_context(patch(f"{target}.run_agentic_task"))
+        stack.enter_context(
+            patch(f"{target}.load_workflow_state", return_value=(None, None)))
+        stack.enter_context(
+            patch(f"{target}.save_workflow_state", return_value=None))
+        stack.enter_context(patch(f"{target}.clear_workflow_state"))
+        stack.enter_context(
+            patch(f"{target}.load_prompt_template", return_value="Prompt for {issue_number}"))
+        stack.enter_context(
+            patch(f"{target}._check_e2e_environment", return_value=(True, "")))
+        stack.enter_context(patch(f"{target}.console"))
+        stack.enter_context(
+            patch(f"{target}.classify_step_output", return_value=None))
+        mock_run.side_effect = _step_side_effect
+        yield mock_run
+
+
+@pytest.fixture(autouse=True)
+def reset_orchestrator_mocks(orchestrator_mocks):
+    """Clear recorded calls between tests sharing the class-level patches."""
+    yield
+    orchestrator_mocks.reset_mock()
+
+
+class _Result(NamedTuple):
+    """Return value of run_agentic_e2e_fix_orchestrator."""
+    success: bool
+    message: str
+    cost: float
+    model: str
+    files: List[Any]
+
+
+def _run_orchestrator_with_all_tests_pass(worktree: Path) -> _Result:
     """Run the full orchestrator with Step 2 returning ALL_TESTS_PASS.
 
-    Only mocks LLM calls and state persistence. _get_file_hashes and
-    _commit_and_push run unpatched against the real git repo.
+    Relies on the class-level ``orchestrator_mocks`` patches.
     """
     from pdd.agentic_e2e_fix_orchestrator import run_agentic_e2e_fix_orchestrator
 
-    def step_side_effect(*args, **kwargs):
-        """Mock LLM: Step 2 returns ALL_TESTS_PASS, everything else passes."""
-        label = kwargs.get("label", "")
-        if "step2" in label:
-            return (True, "ALL_TESTS_PASS", 0.1, "gpt-4")
-        return (True, f"Output for {label}", 0.1, "gpt-4")
-
-    with patch("pdd.agentic_e2e_fix_orchestrator.run_agentic_task") as mock_run, \
-         patch("pdd.agentic_e2e_fix_orchestrator.load_workflow_state") as mock_load, \
-         patch("pdd.agentic_e2e_fix_orchestrator.save_workflow_state") as mock_save, \
-         patch("pdd.agentic_e2e_fix_orchestrator.clear_workflow_state") as mock_clear, \
-         patch("pdd.agentic_e2e_fix_orchestrator.load_prompt_template") as mock_template, \
-         patch("pdd.agentic_e2e_fix_orchestrator._check_e2e_environment", return_value=(True, "")), \
-         patch("pdd.agentic_e2e_fix_orchestrator.console"), \
-         patch("pdd.agentic_e2e_fix_orchestrator.classify_step_output", return_value=None):
-
-        mock_run.side_effect = step_side_effect
-        mock_load.return_value = (None, None)
-        mock_save.return_value = None
-        mock_template.return_value = "Prompt for {issue_number}"
-
-        success, message, cost, model, files = run_agentic_e2e_fix_orchestrator(
-            issue_url="http://github.com/owner/repo/issues/545",
-            issue_content="Bug: pdd fix exits 'no changes to commit'",
-            repo_owner="owner",
-            repo_name="repo",
-            issue_number=545,
-            issue_author="user",
-            issue_title="Fix unstaged changes on resume",
-            cwd=worktree,
-            quiet=True,
-            max_cycles=1,
-            resume=False,
-            use_github_state=False,
-        )
-
-    return success, message, cost, model, files
+    return _Result(*run_agentic_e2e_fix_orchestrator(
+        issue_url="http://github.com/owner/repo/issues/545",
+        issue_content="Bug: pdd fix exits 'no changes to commit'",
+        repo_owner="owner",
+        repo_name="repo",
+        issue_number=545,
+        issue_author="user",
+        issue_title="Fix unstaged changes on resume",
+        cwd=worktree,
+        quiet=True,
+        max_cycles=1,
+        resume=False,
+        use_github_state=False,
+    ))
 
 
 class TestIssue545OrphanedChangesCommittedE2E:
@@ -111,7 +197,7 @@ class TestIssue545OrphanedChangesCommittedE2E:
     orchestrator must still detect and commit the orphaned unstaged changes.
     """
 
-    def test_orchestrator_commits_orphaned_changes_on_all_tests_pass(self, tmp_path):
+    def test_orchestrator_commits_orphaned_changes_on_all_tests_pass(self, tmp_path, seed_commit):
         """Primary E2E bug test: orchestrator must commit a pre-existing
         unstaged modification when ALL_TESTS_PASS at Step 2.
 
@@ -123,14 +209,14 @@ class TestIssue545OrphanedChangesCommittedE2E:
         5. Bug: hash delta is zero -> "No changes to commit" -> file orphaned
         6. Fix: fallback to _get_modified_and_untracked() detects the change
         """
-        worktree, module = _create_git_repo_with_remote(tmp_path)
+        worktree, module = _create_git_repo_with_remote(tmp_path, seed_commit, push=True)
 
         # Simulate prior run's modification (exists BEFORE orchestrator starts)
         module.write_text("x = 2  # fixed by prior interrupted run\n")
 
-        success, message, cost, model, files = _run_orchestrator_with_all_tests_pass(worktree)
+        result = _run_orchestrator_with_all_tests_pass(worktree)
 
-        assert success is True, f"Orchestrator should succeed, got message: {message}"
+        assert result.success is True, f"Orchestrator should succeed, got message: {result.message}"
 
         # Assert on REAL git state — the orphaned file must be committed
         diff_result = subprocess.run(
@@ -160,35 +246,34 @@ class TestIssue545OrphanedChangesCommittedE2E:
             f"but unpushed commits exist: {unpushed.stdout.strip()!r}"
         )
 
-    def test_orchestrator_commits_multiple_orphaned_files(self, tmp_path):
+    def test_orchestrator_commits_multiple_orphaned_files(self, tmp_path, seed_commit):
         """E2E test: orchestrator commits ALL orphaned files, not just one.
 
         Simulates the real-world scenario from the issue where 9+ files were
         left as unstaged changes after a prior interrupted run.
         """
-        worktree, module = _create_git_repo_with_remote(tmp_path)
+        worktree, module = _create_git_repo_with_remote(tmp_path, seed_commit)
 
         # Create additional committed files
         pdd_dir = worktree / "pdd"
-        for name in ["code_generator.py", "llm_invoke.py", "preprocess.py"]:
-            f = pdd_dir / name
-            f.write_text(f"# original {name}\n")
+        names = ["code_generator.py", "llm_invoke.py", "preprocess.py"]
+        _seed_files({pdd_dir / name: f"# original {name}\n".encode() for name in names})
         subprocess.run(["git", "add", "."],
                        cwd=worktree, check=True, capture_output=True)
-        subprocess.run(["git", "commit", "-m", "add more files"],
-                       cwd=worktree, check=True, capture_output=True)
-        subprocess.run(["git", "push"],
+        subprocess.run(["git", *_GIT_IDENTITY, "commit", "-m", "add more files"],
                        cwd=worktree, check=True, capture_output=True)
 
         # Simulate prior run modifying ALL files (orphaned unstaged changes)
-        module.write_text("x = 2  # fixed\n")
-        (pdd_dir / "code_generator.py").write_text("# fixed code_generator\n")
-        (pdd_dir / "llm_invoke.py").write_text("# fixed llm_invoke\n")
-        (pdd_dir / "preprocess.py").write_text("# fixed preprocess\n")
+        _seed_files({
+            module: b"x = 2  # fixed\n",
+            pdd_dir / "code_generator.py": b"# fixed code_generator\n",
+            pdd_dir / "llm_invoke.py": b"# fixed llm_invoke\n",
+            pdd_dir / "preprocess.py": b"# fixed preprocess\n",
+        })
 
-        success, message, cost, model, files = _run_orchestrator_with_all_tests_pass(worktree)
+        result = _run_orchestrator_with_all_tests_pass(worktree)
 
-        assert success is True, f"Orchestrator should succeed, got: {message}"
+        assert result.success is True, f"Orchestrator should succeed, got: {result.message}"
 
         # All 4 orphaned files must be committed
         diff_result = subprocess.run(
@@ -202,19 +287,19 @@ class TestIssue545OrphanedChangesCommittedE2E:
             f"'No changes to commit' because the hash snapshot was tainted."
         )
 
-    def test_orchestrator_reports_no_changes_when_worktree_is_clean(self, tmp_path):
+    def test_orchestrator_reports_no_changes_when_worktree_is_clean(self, tmp_path, seed_commit):
         """Regression guard: clean worktree stays clean after orchestrator run.
 
         When there are no pre-existing modifications, the orchestrator should
         NOT create spurious commits. This ensures the fallback doesn't introduce
         false positives.
         """
-        worktree, module = _create_git_repo_with_remote(tmp_path)
+        worktree, module = _create_git_repo_with_remote(tmp_path, seed_commit)
 
         # NO modifications — worktree is clean
-        success, message, cost, model, files = _run_orchestrator_with_all_tests_pass(worktree)
+        result = _run_orchestrator_with_all_tests_pass(worktree)
 
-        assert success is True
+        assert result.success is True, result.message
 
         # Verify no spurious commits were created
         log_result = subprocess.run(
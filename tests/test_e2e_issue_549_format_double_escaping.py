@@ -12,17 +12,40 @@ receives {{"error": ...}} instead of {"error": ...}.
 The same escaping bug exists on the resume path (line 317) and in multiple
 other orchestrator files (agentic_change_orchestrator.py, etc.).
 
-Fix: Replace .format(**context) with iterative str.replace() — the existing
-safe pattern in template_expander.py:155-156 — and remove the value escaping.
+Fix: Replace .format(**context) with substitute_template_variables(), which
+substitutes known placeholders in a single regex pass, and remove the value
+escaping.
 """
 
 import re
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from unittest.mock import patch
 
 import pytest
 
+import pdd as _pdd_pkg
 from pdd.agentic_bug_orchestrator import run_agentic_bug_orchestrator
+from pdd.agentic_common import substitute_template_variables
+from pdd.template_expander import expand_template
+
+_PDD_DIR = Path(_pdd_pkg.__file__).parent
+
+_RETRY_SUFFIX_RE = re.compile(r"_\d+$")
+
+# Both Issue #549 source patterns, matched in a single scan per file:
+# .format(**context) and brace-escaping of context values.
+_FORBIDDEN_SOURCE_RE = re.compile(
+    r'\.format\(\*\*context\)|\.replace\("\{", "\{\{"\)\.replace\("\}", "\}\}"\)'
+)
+
+# Byte needles for the instruction checks; each instruction is encoded once
+# per assertion block and scanned against these.
+_DOUBLE_BRACE = b"{{"
+_URL_PLACEHOLDER = b"{url}"
+_DOUBLED_URL_PLACEHOLDER = b"{{url}}"
+_JSON_BLOCK_A = b'{"a": 1}'
+_JSON_BLOCK_B = b'{"b": 2, "c": "three"}'
 
 
 # ---------------------------------------------------------------------------
@@ -30,16 +53,28 @@ from pdd.agentic_bug_orchestrator import run_agentic_bug_orchestrator
 # ---------------------------------------------------------------------------
 
 
+@pytest.fixture(scope="module")
+def orchestrator_sources():
+    """Map each agentic_*_orchestrator.py filename to its source text.
+
+    The files are read once per module, concurrently.
+    """
+    files = sorted(_PDD_DIR.glob("agentic_*_orchestrator.py"))
+    with ThreadPoolExecutor() as executor:
+        sources = executor.map(Path.read_text, files)
+        return {f.name: source for f, source in zip(files, sources)}
+
+
 @pytest.fixture(autouse=True)
 def set_pdd_path(monkeypatch):
     """Set PDD_PATH to the pdd package directory.
 
     Required so that preprocess() can resolve <include> directives when the
     template contains them (harmless for templates without includes).
+    The env var itself is set per test because conftest's preserve_pdd_path
+    restores PDD_PATH after every test.
     """
-    import pdd as pdd_pkg
-    pdd_package_dir = Path(pdd_pkg.__file__).parent
-    monkeypatch.setenv("PDD_PATH", str(pdd_package_dir))
+    monkeypatch.setenv("PDD_PATH", str(_PDD_DIR))
 
 
 @pytest.fixture
@@ -62,7 +97,11 @@ def mock_dependencies(tmp_path):
 
 @pytest.fixture
 def default_args(tmp_path):
-    """Default keyword arguments for run_agentic_bug_orchestrator."""
+    """Default keyword arguments for run_agentic_bug_orchestrator.
+
+    Kept function-scoped: the orchestrator saves workflow state under cwd,
+    so a shared cwd would let one test resume another's run.
+    """
     return {
         "issue_url": "http://github.com/owner/repo/issues/1",
         "issue_content": "Bug description",
@@ -87,24 +126,36 @@ def _make_side_effects(step_outputs_by_label=None, *, captured=None):
         captured: optional dict; if given, the instruction for each label is
             stored in it.
     """
-    step_outputs_by_label = step_outputs_by_label or {}
+    # Precomputed label -> result tuple; other labels are filled in on first use.
+    dispatch = {
+        label: (True, out, 0.1, "gpt-4")
+        for label, out in (step_outputs_by_label or {}).items()
+    }
+    # Avoid the "no FILES_CREATED" hard stop at step 7 unless overridden
+    dispatch.setdefault("step7", (True, "FILES_CREATED: test.py", 0.1, "gpt-4"))
 
     def side_effect(*args, **kwargs):
         label = kwargs.get("label", "")
-        instruction = kwargs.get("instruction", "")
         if captured is not None:
-            captured[label] = instruction
-        if label in step_outputs_by_label:
-            out = step_outputs_by_label[label]
-            return (True, out, 0.1, "gpt-4")
-        if label == "step7":
-            # Avoid the "no FILES_CREATED" hard stop
-            return (True, "FILES_CREATED: test.py", 0.1, "gpt-4")
-        return (True, f"Output for {label}", 0.1, "gpt-4")
+            captured[label] = kwargs.get("instruction", "")
+        result = dispatch.get(label)
+        if result is None:
+            result = dispatch[label] = (True, f"Output for {label}", 0.1, "gpt-4")
+        return result
 
     return side_effect
 
 
+def _fail_on_doubled_braces(instruction, message):
+    """Fail if instruction contains doubled braces, showing a short snippet.
+
+    The instruction is scanned as UTF-8 bytes; the repr for the failure
+    message is only built when the check fails.
+    """
+    if _DOUBLE_BRACE in instruction.encode():
+        pytest.fail(f"{message}\nGot instruction snippet: {instruction[:300]!r}")
+
+
 # ---------------------------------------------------------------------------
 # Test 1 (PRIMARY): JSON in step output must appear literally in next prompt
 # ---------------------------------------------------------------------------
@@ -149,9 +200,9 @@ def test_json_in_step_output_not_double_escaped_in_next_prompt(
     assert step2_instruction, "run_agentic_task was not called for step2"
 
     # BUG: instruction contains {{"error": ...}} (doubled) — corrupts the LLM prompt
-    assert "{{" not in step2_instruction, (
-        f"Step 2 prompt has doubled curly braces — Issue #549 bug present.\n"
-        f"Got: {repr(step2_instruction)}"
+    _fail_on_doubled_braces(
+        step2_instruction,
+        "Step 2 prompt has doubled curly braces — Issue #549 bug present.",
     )
     # FIX: original JSON must appear literally
     assert JSON_OUTPUT in step2_instruction, (
@@ -199,13 +250,14 @@ def test_step_output_with_format_like_placeholder_not_doubled(
     step2_instruction = captured.get("step2", "")
     assert step2_instruction, "run_agentic_task was not called for step2"
 
+    step2_bytes = step2_instruction.encode()
     # BUG: {{url}} appears instead of {url}
-    assert "{{url}}" not in step2_instruction, (
+    assert _DOUBLED_URL_PLACEHOLDER not in step2_bytes, (
         f"Step 2 prompt has {{{{url}}}} (doubled) — Issue #549 bug.\n"
         f"Got: {repr(step2_instruction)}"
     )
     # FIX: single-brace {url} must be in the instruction
-    assert "{url}" in step2_instruction, (
+    assert _URL_PLACEHOLDER in step2_bytes, (
         f"Step 2 prompt should contain literal {{url}}.\n"
         f"Got: {repr(step2_instruction)}"
     )
@@ -246,9 +298,8 @@ def test_nested_json_in_step_output_preserved(mock_dependencies, default_args):
     step2_instruction = captured.get("step2", "")
     assert step2_instruction, "run_agentic_task was not called for step2"
 
-    assert "{{" not in step2_instruction, (
-        f"Nested JSON has doubled braces — Issue #549 bug.\n"
-        f"Got: {repr(step2_instruction)}"
+    _fail_on_doubled_braces(
+        step2_instruction, "Nested JSON has doubled braces — Issue #549 bug."
     )
     assert NESTED_JSON in step2_instruction, (
         f"Nested JSON not preserved. Got: {repr(step2_instruction)}"
@@ -289,14 +340,15 @@ def test_multiple_json_blocks_in_step_output_preserved(
     step2_instruction = captured.get("step2", "")
     assert step2_instruction, "run_agentic_task was not called for step2"
 
-    assert "{{" not in step2_instruction, (
-        f"Multiple JSON blocks have doubled braces — Issue #549 bug.\n"
-        f"Got: {repr(step2_instruction)}"
+    _fail_on_doubled_braces(
+        step2_instruction,
+        "Multiple JSON blocks have doubled braces — Issue #549 bug.",
     )
-    assert '{"a": 1}' in step2_instruction, (
+    step2_bytes = step2_instruction.encode()
+    assert _JSON_BLOCK_A in step2_bytes, (
         f"First JSON block not preserved. Got: {repr(step2_instruction)}"
     )
-    assert '{"b": 2, "c": "three"}' in step2_instruction, (
+    assert _JSON_BLOCK_B in step2_bytes, (
         f"Second JSON block not preserved. Got: {repr(step2_instruction)}"
     )
 
@@ -341,15 +393,15 @@ def test_plain_text_step_output_substituted_correctly(
 
 
 # ---------------------------------------------------------------------------
-# Test 6 (UNIT): The safe str.replace() approach correctly preserves JSON
+# Test 6 (UNIT): Single-pass placeholder substitution preserves JSON
 # ---------------------------------------------------------------------------
 
 
 def test_safe_str_replace_substitution_preserves_json_braces():
     """
-    Unit test showing that the str.replace() pattern (proposed fix, from
-    template_expander.py:155-156) preserves JSON curly braces, while the
-    buggy .format(**context) + value escaping does NOT.
+    Unit test showing that substitute_template_variables and expand_template
+    preserve JSON curly braces in substituted values, while
+    the buggy .format(**context) + value escaping does NOT.
 
     This documents the fundamental Python behaviour:
       str.format() does NOT un-double {{ }} in *substituted values* —
@@ -364,12 +416,31 @@ def test_safe_str_replace_substitution_preserves_json_braces():
     buggy_result = template.format(**{"step1_output": escaped})
     # buggy_result == 'Analysis: {{"error": "Insufficient role", "required": "admin"}}'
 
-    # --- Safe approach (proposed fix: template_expander.py pattern) ---
-    safe_result = template
-    for key, value in context.items():
-        safe_result = safe_result.replace("{" + key + "}", str(value))
+    # --- Safe approach (the fix): substitute_template_variables ---
+    # Values are inserted literally, so no brace escaping is needed.
+    safe_result = substitute_template_variables(template, context)
     # safe_result == 'Analysis: {"error": "Insufficient role", "required": "admin"}'
 
+    # Substituted values are not re-scanned: a placeholder-like token inside
+    # a value survives verbatim instead of being expanded.
+    nested = substitute_template_variables(
+        "{step1_output} / {step2_output}",
+        {"step1_output": '{"next": "{step2_output}"}', "step2_output": "done"},
+    )
+    assert nested == '{"next": "{step2_output}"} / done', (
+        f"Substituted values must not be re-expanded. Got: {repr(nested)}"
+    )
+
+    # template_expander makes the same single-pass guarantee for path
+    # templates.
+    expanded = expand_template(
+        "out/{name}/{category}", {"name": json_value, "category": "{name}"}
+    )
+    assert expanded == f"out/{json_value}/{{name}}", (
+        f"expand_template should insert brace-containing values verbatim. "
+        f"Got: {repr(expanded)}"
+    )
+
     # The safe result must contain the original JSON literally with no doubling
     assert json_value in safe_result, (
         f"Safe substitution should preserve JSON. Got: {repr(safe_result)}"
@@ -387,75 +458,46 @@ def test_safe_str_replace_substitution_preserves_json_braces():
 
 
 # ---------------------------------------------------------------------------
-# Test 7 (STRUCTURAL): Buggy value-escaping pattern must not exist in source
+# Test 7 (STRUCTURAL): No orchestrator may use either Issue #549 pattern
 # ---------------------------------------------------------------------------
 
 
-def test_agentic_bug_orchestrator_does_not_escape_context_values():
+def test_orchestrators_do_not_use_format_or_escape_context_values(orchestrator_sources):
     """
-    Issue #549 STRUCTURAL: agentic_bug_orchestrator.py must NOT escape
-    context values with .replace("{", "{{") before prompt substitution.
-
-    Lines 317 and 435 of the current code contain:
+    Issue #549 STRUCTURAL: No agentic orchestrator file may use
+    .format(**context) for prompt substitution, nor escape context values with
         escaped_output = output.replace("{", "{{").replace("}", "}}")
-    which is the root cause of Issue #549.
-
-    After the fix, this pattern should be absent.
-    """
-    import pdd.agentic_bug_orchestrator as mod
-
-    source_path = Path(mod.__file__)
-    source = source_path.read_text()
-
-    # The buggy escaping pattern applied to context values
-    buggy_pattern = '.replace("{", "{{").replace("}", "}}")'
-
-    assert buggy_pattern not in source, (
-        f"Found buggy brace-escaping pattern in {source_path.name} — "
-        "this is the root cause of Issue #549.\n"
-        "Remove the .replace('{', '{{') calls and use iterative str.replace() "
-        "for template substitution instead of .format(**context)."
-    )
 
+    The escaping (formerly lines 317 and 435 of agentic_bug_orchestrator.py)
+    combined with the two-pass .format() chain (orchestrator + llm_invoke.py)
+    is the root cause of the double-escaping bug. Each source is read once and
+    scanned once for both patterns.
 
-# ---------------------------------------------------------------------------
-# Test 8 (STRUCTURAL): All orchestrators must use safe format pattern
-# ---------------------------------------------------------------------------
-
-
-def test_all_orchestrators_do_not_use_format_with_context_dict():
-    """
-    Issue #549 STRUCTURAL: No agentic orchestrator file should use
-    .format(**context) for prompt substitution. This two-pass .format()
-    chain (orchestrator + llm_invoke.py) causes the double-escaping bug.
-
-    After the fix all orchestrators should use iterative str.replace()
-    following the template_expander.py:155-156 pattern.
+    After the fix all orchestrators should use substitute_template_variables()
+    from agentic_common.py.
     """
-    import pdd as pdd_pkg
-
-    pdd_dir = Path(pdd_pkg.__file__).parent
-    orchestrator_files = list(pdd_dir.glob("agentic_*_orchestrator.py"))
-
-    assert orchestrator_files, f"No orchestrator files found in {pdd_dir}"
+    assert "agentic_bug_orchestrator.py" in orchestrator_sources, (
+        "agentic_bug_orchestrator.py not found among agentic_*_orchestrator.py files"
+    )
 
-    violations = []
-    for filepath in orchestrator_files:
-        source = filepath.read_text()
-        if ".format(**context)" in source:
-            violations.append(filepath.name)
+    violations = [
+        f"{name}: {match.group()}"
+        for name, source in orchestrator_sources.items()
+        if (match := _FORBIDDEN_SOURCE_RE.search(source))
+    ]
 
     assert not violations, (
-        f"Orchestrator files still use .format(**context) — Issue #549 pattern: "
-        f"{violations}. Replace with iterative str.replace() following "
-        "template_expander.py:155-156."
+        f"Orchestrator files still use an Issue #549 pattern: "
+        f"{violations}. Remove the .replace('{{', '{{{{') calls and replace "
+        ".format(**context) with substitute_template_variables() from "
+        "agentic_common.py."
     )
 
 
 # ---------------------------------------------------------------------------
 # E2E Integration Tests (Step 9): Use REAL prompt templates, mock only LLM
 # ---------------------------------------------------------------------------
-# These tests differ from tests 1–8 above by NOT mocking load_prompt_template.
+# These tests differ from tests 1–7 above by NOT mocking load_prompt_template.
 # The orchestrator loads real templates from pdd/prompts/ which contain the
 # real {step1_output} / {step2_output} placeholders.  Only run_agentic_task
 # (the LLM call) is mocked so we can control what each "step" returns and
@@ -499,7 +541,7 @@ def test_e2e_json_in_step1_output_double_escaped_in_real_step2_prompt(
       code stores     : {{"error": "Insufficient role"}}  ← incorrect escaping
       step 2 receives : …{{"error": "Insufficient role"}}…  ← doubled braces
 
-    Fix (iterative str.replace):
+    Fix (substitute_template_variables):
       step 2 receives : …{"error": "Insufficient role"}…   ← single braces
     """
     mock_run = real_template_deps
@@ -525,10 +567,10 @@ def test_e2e_json_in_step1_output_double_escaped_in_real_step2_prompt(
     assert step2_instruction, "run_agentic_task was not called for step2"
 
     # BUG: real template formatted with escaped value produces doubled braces
-    assert "{{" not in step2_instruction, (
-        f"Step 2 prompt (real template) has doubled curly braces — Issue #549 "
-        f"bug is present in the full orchestrator code path.\n"
-        f"Got instruction snippet: {repr(step2_instruction[:300])}"
+    _fail_on_doubled_braces(
+        step2_instruction,
+        "Step 2 prompt (real template) has doubled curly braces — Issue #549 "
+        "bug is present in the full orchestrator code path.",
     )
     # FIX: the original JSON literal must reach the LLM unchanged
     assert JSON_OUTPUT in step2_instruction, (
@@ -568,10 +610,10 @@ def test_e2e_json_in_step2_output_double_escaped_in_real_step3_prompt(
     step3_instruction = captured.get("step3", "")
     assert step3_instruction, "run_agentic_task was not called for step3"
 
-    assert "{{" not in step3_instruction, (
-        f"Step 3 prompt (real template) has doubled curly braces — Issue #549 "
-        f"affects the step2→step3 boundary.\n"
-        f"Got instruction snippet: {repr(step3_instruction[:300])}"
+    _fail_on_doubled_braces(
+        step3_instruction,
+        "Step 3 prompt (real template) has doubled curly braces — Issue #549 "
+        "affects the step2→step3 boundary.",
     )
     assert JSON_OUTPUT in step3_instruction, (
         f"Step 3 prompt should contain the original JSON {repr(JSON_OUTPUT)}.\n"
@@ -609,7 +651,8 @@ def test_e2e_orchestrator_completes_without_keyerror_with_json_step_outputs(
 
     def side_effect(**kwargs):
         label = kwargs.get("label", "")
-        step_key = re.sub(r"_\d+$", "", label)  # strip retry suffix if any
+        # Strip a retry suffix if any
+        step_key = _RETRY_SUFFIX_RE.sub("", label)
         return (True, json_outputs_by_step.get(step_key, f"Output for {label}"), 0.1, "gpt-4")
 
     mock_run.side_effect = side_effect
@@ -623,5 +666,5 @@ def test_e2e_orchestrator_completes_without_keyerror_with_json_step_outputs(
             f"KeyError key: {exc}\n"
             f"This means the second .format() call in the pipeline interpreted a JSON key "
             f"as a Python format placeholder.\n"
-            f"Fix: replace .format(**context) with iterative str.replace()."
+            f"Fix: replace .format(**context) with substitute_template_variables()."
         )
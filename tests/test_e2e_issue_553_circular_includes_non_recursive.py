@@ -11,10 +11,18 @@ Issue #553 reports that the default (non-recursive) path was not covered by that
 """
 
 import os
+import shutil
 import subprocess
 import sys
-import pytest
 from pathlib import Path
+from typing import Dict
+
+import pytest
+
+
+# Tagged slow so `-m "not slow"` can skip them locally; CI still runs them
+# (in parallel under -n auto) since each test works in its own tmp_path.
+pytestmark = pytest.mark.slow
 
 
 # Timeout in seconds for subprocess — buggy code loops forever, so this must be finite.
@@ -32,17 +40,55 @@ def _get_project_root() -> Path:
     raise RuntimeError("Could not find project root with pdd/ directory")
 
 
+# Static part of every invocation, built once.
+_PREPROCESS_CMD = (sys.executable, "-m", "pdd.cli", "--force", "preprocess")
+_PROJECT_ROOT = str(_get_project_root())
+
+
+def _write_files(base: Path, mapping: Dict[str, str]) -> None:
+    """Write each name -> content pair under base as UTF-8 bytes."""
+    for name, content in mapping.items():
+        (base / name).write_bytes(content.encode())
+
+
+# The canonical non-circular chain: top -> mid -> leaf.
+_INCLUDE_CHAIN = {
+    "top_python.prompt": "Top\n<include>mid.txt</include>\n",
+    "mid.txt": "Mid\n<include>leaf.txt</include>\n",
+    "leaf.txt": "Leaf\n",
+}
+
+
+@pytest.fixture(scope="session")
+def include_chain_factory(tmp_path_factory):
+    """Write the include chain once; return a factory that copies it into a test dir.
+
+    The factory returns the path of the chain's entry file inside the given dir.
+    """
+    source = tmp_path_factory.mktemp("include_chain")
+    _write_files(source, _INCLUDE_CHAIN)
+
+    def copy_into(dest: Path) -> Path:
+        # Copy rather than symlink: creating symlinks needs extra privileges
+        # on Windows.
+        for name in _INCLUDE_CHAIN:
+            shutil.copyfile(source / name, dest / name)
+        return dest / "top_python.prompt"
+
+    return copy_into
+
+
 def _run_pdd_preprocess(prompt_file: str, cwd: str, extra_args: list = None):
     """Run `pdd --force preprocess <prompt_file>` via subprocess with timeout.
 
-    Returns (returncode, stdout, stderr) or raises subprocess.TimeoutExpired
-    if the process hangs (indicating the infinite loop bug).
+    Returns a CompletedProcess (returncode, stdout, stderr) or raises
+    subprocess.TimeoutExpired if the process hangs (indicating the infinite
+    loop bug). The child is killed on timeout, so a hang never leaks into
+    later tests.
     """
-    cmd = [sys.executable, "-m", "pdd.cli", "--force", "preprocess", prompt_file]
-    if extra_args:
-        cmd.extend(extra_args)
+    cmd = [*_PREPROCESS_CMD, prompt_file, *(extra_args or ())]
     env = os.environ.copy()
-    env["PYTHONPATH"] = str(_get_project_root())
+    env["PYTHONPATH"] = _PROJECT_ROOT
     return subprocess.run(
         cmd,
         capture_output=True,
@@ -53,23 +99,60 @@ def _run_pdd_preprocess(prompt_file: str, cwd: str, extra_args: list = None):
     )
 
 
+# (id, {file name: content}, entry file) for each include cycle shape.
+CYCLE_CASES = [
+    # The exact bug report: A includes B, B includes A.
+    (
+        "mutual",
+        {
+            "a_python.prompt": "Hello\n<include>b_python.prompt</include>\n",
+            "b_python.prompt": "World\n<include>a_python.prompt</include>\n",
+        },
+        "a_python.prompt",
+    ),
+    (
+        "self_referencing",
+        {"self_ref_python.prompt": "Content\n<include>self_ref_python.prompt</include>\n"},
+        "self_ref_python.prompt",
+    ),
+    (
+        "three_file",
+        {
+            "a_python.prompt": "AAA\n<include>b_python.prompt</include>\n",
+            "b_python.prompt": "BBB\n<include>c_python.prompt</include>\n",
+            "c_python.prompt": "CCC\n<include>a_python.prompt</include>\n",
+        },
+        "a_python.prompt",
+    ),
+    (
+        "backtick",
+        {
+            "x_python.prompt": "Foo\n```<y_python.prompt>```\n",
+            "y_python.prompt": "Bar\n```<x_python.prompt>```\n",
+        },
+        "x_python.prompt",
+    ),
+]
+
+
 class TestIssue553CircularIncludesNonRecursiveE2E:
     """E2E: `pdd preprocess` (non-recursive) on circular includes must error, not loop forever."""
 
-    def test_mutual_circular_includes_default_mode(self, tmp_path):
-        """Reproduce the exact bug: A includes B, B includes A, default (non-recursive) mode.
+    @pytest.mark.parametrize(
+        "files, entry",
+        [case[1:] for case in CYCLE_CASES],
+        ids=[case[0] for case in CYCLE_CASES],
+    )
+    def test_circular_includes_default_mode(self, tmp_path, files, entry):
+        """Circular includes must error out, not loop forever, in default (non-recursive) mode.
 
         Bug behavior: process hangs forever, spamming "Processing XML include" messages.
         Expected: non-zero exit code with "Circular include detected" in output, within seconds.
         """
-        a_file = tmp_path / "a_python.prompt"
-        b_file = tmp_path / "b_python.prompt"
-
-        a_file.write_text("Hello\n<include>b_python.prompt</include>\n")
-        b_file.write_text("World\n<include>a_python.prompt</include>\n")
+        _write_files(tmp_path, files)
 
         try:
-            result = _run_pdd_preprocess(str(a_file), cwd=str(tmp_path))
+            result = _run_pdd_preprocess(str(tmp_path / entry), cwd=str(tmp_path))
         except subprocess.TimeoutExpired:
             pytest.fail(
                 f"pdd preprocess hung for {CLI_TIMEOUT}s — infinite loop detected (bug #553). "
@@ -89,71 +172,15 @@ class TestIssue553CircularIncludesNonRecursiveE2E:
             f"stdout: {result.stdout[:500]}\nstderr: {result.stderr[:500]}"
         )
 
-    def test_self_referencing_include_default_mode(self, tmp_path):
-        """A file that includes itself must not loop forever in non-recursive mode."""
-        self_file = tmp_path / "self_ref_python.prompt"
-        self_file.write_text("Content\n<include>self_ref_python.prompt</include>\n")
-
-        try:
-            result = _run_pdd_preprocess(str(self_file), cwd=str(tmp_path))
-        except subprocess.TimeoutExpired:
-            pytest.fail(
-                f"pdd preprocess hung for {CLI_TIMEOUT}s — self-referencing infinite loop (bug #553)."
-            )
-
-        assert result.returncode != 0, (
-            f"Self-referencing include should error, got exit code {result.returncode}."
-        )
-
-    def test_three_file_cycle_default_mode(self, tmp_path):
-        """A→B→C→A cycle via CLI must not loop forever in non-recursive mode."""
-        (tmp_path / "a_python.prompt").write_text("AAA\n<include>b_python.prompt</include>\n")
-        (tmp_path / "b_python.prompt").write_text("BBB\n<include>c_python.prompt</include>\n")
-        (tmp_path / "c_python.prompt").write_text("CCC\n<include>a_python.prompt</include>\n")
-
-        try:
-            result = _run_pdd_preprocess(
-                str(tmp_path / "a_python.prompt"), cwd=str(tmp_path)
-            )
-        except subprocess.TimeoutExpired:
-            pytest.fail(
-                f"pdd preprocess hung for {CLI_TIMEOUT}s — 3-file cycle infinite loop (bug #553)."
-            )
-
-        assert result.returncode != 0, (
-            f"Three-file cycle should error, got exit code {result.returncode}."
-        )
-
-    def test_backtick_circular_includes_default_mode(self, tmp_path):
-        """Backtick-style circular includes must also be detected in non-recursive mode."""
-        x_file = tmp_path / "x_python.prompt"
-        y_file = tmp_path / "y_python.prompt"
-
-        x_file.write_text("Foo\n```<y_python.prompt>```\n")
-        y_file.write_text("Bar\n```<x_python.prompt>```\n")
-
-        try:
-            result = _run_pdd_preprocess(str(x_file), cwd=str(tmp_path))
-        except subprocess.TimeoutExpired:
-            pytest.fail(
-                f"pdd preprocess hung for {CLI_TIMEOUT}s — backtick circular include loop (bug #553)."
-            )
-
-        assert result.returncode != 0, (
-            f"Backtick circular include should error, got exit code {result.returncode}."
-        )
-
-    def test_non_circular_includes_still_work(self, tmp_path):
+    def test_non_circular_includes_still_work(self, tmp_path, include_chain_factory):
         """Non-circular chain (A→B→C) must still preprocess successfully in default mode."""
-        (tmp_path / "top_python.prompt").write_text("Top\n<include>mid.txt</include>\n")
-        (tmp_path / "mid.txt").write_text("Mid\n<include>leaf.txt</include>\n")
-        (tmp_path / "leaf.txt").write_text("Leaf\n")
+        entry = include_chain_factory(tmp_path)
 
         output_file = tmp_path / "output.txt"
 
         try:
             result = _run_pdd_preprocess(
-                str(tmp_path / "top_python.prompt"),
+                str(entry),
                 cwd=str(tmp_path),
                 extra_args=["--output", str(output_file)],
             )
@@ -176,15 +203,14 @@ class TestIssue553CircularIncludesNonRecursiveE2E:
 
     def test_recursive_mode_still_detects_cycle(self, tmp_path):
         """Sanity check: --recursive mode still catches circular includes (regression guard)."""
-        a_file = tmp_path / "a_python.prompt"
-        b_file = tmp_path / "b_python.prompt"
-
-        a_file.write_text("Hello\n<include>b_python.prompt</include>\n")
-        b_file.write_text("World\n<include>a_python.prompt</include>\n")
+        _write_files(tmp_path, {
+            "a_python.prompt": "Hello\n<include>b_python.prompt</include>\n",
+            "b_python.prompt": "World\n<include>a_python.prompt</include>\n",
+        })
 
         try:
             result = _run_pdd_preprocess(
-                str(a_file), cwd=str(tmp_path), extra_args=["--recursive"]
+                str(tmp_path / "a_python.prompt"), cwd=str(tmp_path), extra_args=["--recursive"]
             )
         except subprocess.TimeoutExpired:
             pytest.fail("--recursive mode should not hang on circular includes.")
@@ -0,0 +1,130 @@
+"""Tests for issue #555: sync cost/model extraction read the wrong tuple index.
+
+crash/fix/verify return 6-tuples with cost at index 4 and model at index 5, and
+generate returns a 4-tuple with cost at index 2 and model at index 3. The fix
+routes every operation through the ``_COST_IDX`` / ``_MODEL_IDX`` tables in
+``sync_orchestration``; operations not listed there keep cost at 1, model at 2.
+
+All operations share one parametrized table so each result tuple is built and
+checked once, for both the budget total and the operation log.
+"""
+
+from unittest.mock import patch
+
+import pytest
+
+from pdd.operation_log import log_operation, update_log_entry
+from pdd.sync_orchestration import _extract_cost_from_result, _extract_model_from_result
+
+
+EXTRACTION_CASES = [
+    ("generate", ("content", False, 0.0421, "claude-sonnet-4-6"), 0.0421, "claude-sonnet-4-6"),
+    ("crash", (True, "code", "program", 2, 0.0315, "gpt-4o-mini"), 0.0315, "gpt-4o-mini"),
+    ("fix", (True, "tests", "code", 3, 0.0872, "claude-sonnet-4-6"), 0.0872, "claude-sonnet-4-6"),
+    ("verify", (True, "program", "code", 1, 0.0194, "gpt-4o"), 0.0194, "gpt-4o"),
+    ("example", ("c", 0.0023, "gpt-4o-mini"), 0.0023, "gpt-4o-mini"),
+    ("test", ("test content", 0.0007821, "gpt-4o-mini", True), 0.0007821, "gpt-4o-mini"),
+    ("test_extend", ("test content", 0.0012345, "claude-sonnet-4-6", False), 0.0012345, "claude-sonnet-4-6"),
+]
+
+
+@pytest.mark.parametrize(
+    "op,result,exp_cost,exp_model",
+    EXTRACTION_CASES,
+    ids=[case[0] for case in EXTRACTION_CASES],
+)
+def test_cost_and_model_extracted_at_operation_index(op, result, exp_cost, exp_model):
+    assert _extract_cost_from_result(op, result) == pytest.approx(exp_cost)
+    assert _extract_model_from_result(op, result) == exp_model
+
+
+def test_total_budget_with_all_operations():
+    """Budget accumulation sees every operation's cost, not just generate's."""
+    total = sum(_extract_cost_from_result(op, result) for op, result, _, _ in EXTRACTION_CASES)
+
+    assert total == pytest.approx(sum(case[2] for case in EXTRACTION_CASES))
+
+
+def _passthrough(result, prompt_file=None):
+    return result
+
+
+# One decorated callable per operation, wrapped once at import.
+_LOGGED = {
+    op: log_operation(op, updates_fingerprint=True)(_passthrough)
+    for op, _, _, _ in EXTRACTION_CASES
+}
+
+
+class _UpdateRecorder:
+    """Stands in for update_log_entry and keeps each call's keyword arguments."""
+
+    __slots__ = ("calls",)
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, entry, **kwargs):
+        self.calls.append(kwargs)
+        return update_log_entry(entry, **kwargs)
+
+
+def _first_success_kwargs(recorder):
+    """Keyword arguments of the first successful recorded call, or None."""
+    return next((kwargs for kwargs in recorder.calls if kwargs.get("success")), None)
+
+
+@pytest.fixture(scope="module")
+def log_op_patches():
+    """Patch the decorator's log/fingerprint writes once for the whole module.
+
+    Yields the update_log_entry recorder; it still fills in the entry.
+    """
+    recorder = _UpdateRecorder()
+    with patch("pdd.operation_log.append_log_entry"), \
+         patch("pdd.operation_log.save_fingerprint"), \
+         patch("pdd.operation_log.update_log_entry", recorder):
+        yield recorder
+
+
+@pytest.fixture
+def logged_updates(log_op_patches):
+    log_op_patches.calls.clear()
+    return log_op_patches
+
+
+@pytest.mark.parametrize(
+    "op,result,exp_cost,exp_model",
+    EXTRACTION_CASES,
+    ids=[case[0] for case in EXTRACTION_CASES],
+)
+def test_log_operation_records_extracted_cost(logged_updates, op, result, exp_cost, exp_model):
+    """The @log_operation decorator logs the same cost/model the sync loop budgets."""
+    assert _LOGGED[op](result, prompt_file="prompts/calc_python.prompt") is result
+
+    logged = _first_success_kwargs(logged_updates)
+    assert logged is not None, f"No successful update_log_entry call for {op}"
+    assert logged["cost"] == pytest.approx(exp_cost)
+    assert logged["model"] == exp_model
+
+
+class TestBoolSubclassesIntQuirk:
+    """``bool`` is an ``int`` subclass; a success flag must never count as cost."""
+
+    def test_bool_at_cost_index_is_not_cost(self):
+        # True == 1 would otherwise add $1.00 to the budget.
+        assert _extract_cost_from_result("generate", ("content", False, True, "m")) == 0.0
+
+    def test_int_and_float_subclasses_still_count_as_cost(self):
+        class Dollars(float):
+            pass
+
+        class Cents(int):
+            pass
+
+        assert _extract_cost_from_result("generate", ("c", False, Dollars(0.25), "m")) == 0.25
+        assert _extract_cost_from_result("generate", ("c", False, Cents(3), "m")) == 3.0
+
+    def test_short_tuple_returns_defaults(self):
+        assert _extract_cost_from_result("crash", (True, "code", "program")) == 0.0
+        assert _extract_model_from_result("crash", (True, "code", "program")) == "unknown"
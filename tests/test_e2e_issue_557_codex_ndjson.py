@@ -25,18 +25,38 @@ Only external boundaries are mocked: GitHub CLI (gh), Codex CLI subprocess, and
 provider availability. All internal logic runs for real.
 """
 
+import contextlib
+import functools
 import json
 import os
 import pytest
 from pathlib import Path
-from unittest.mock import patch, MagicMock
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from click.testing import CliRunner
+
+import pdd
 
 
 # ---------------------------------------------------------------------------
 # Helpers
 # ---------------------------------------------------------------------------
 
-def _build_modern_codex_ndjson_with_modules(modules: list[str]) -> str:
+# One reusable compact encoder instead of a fresh JSONEncoder per json.dumps().
+_ENCODER = json.JSONEncoder(separators=(",", ":"))
+
+# Fixed modern Codex NDJSON skeleton; only the agent_message text varies.
+_NDJSON_TEMPLATE = (
+    '{"type":"session.start","session_id":"sess_e2e_557"}\n'
+    '{"type":"item.completed","item":{"type":"tool_call","name":"shell","output":"ls -la"}}\n'
+    '{"type":"item.completed","item":{"type":"agent_message","text":%s}}\n'
+    '{"type":"session.end","usage":{"input_tokens":500,"output_tokens":200}}'
+)
+
+
+@functools.lru_cache(maxsize=32)
+def _build_modern_codex_ndjson_with_modules(modules: tuple[str, ...]) -> str:
     """
     Build realistic modern Codex NDJSON output (0.104.0+ format) that contains
     the structured markers run_agentic_sync expects in the LLM response.
@@ -47,24 +67,10 @@ def _build_modern_codex_ndjson_with_modules(modules: list[str]) -> str:
         f"DEPS_VALID: true\n"
         f"Analysis: Based on the issue, modules {module_list} need synchronization."
     )
-    lines = [
-        json.dumps({"type": "session.start", "session_id": "sess_e2e_557"}),
-        json.dumps({
-            "type": "item.completed",
-            "item": {"type": "tool_call", "name": "shell", "output": "ls -la"}
-        }),
-        json.dumps({
-            "type": "item.completed",
-            "item": {"type": "agent_message", "text": agent_text}
-        }),
-        json.dumps({
-            "type": "session.end",
-            "usage": {"input_tokens": 500, "output_tokens": 200}
-        }),
-    ]
-    return "\n".join(lines)
+    return _NDJSON_TEMPLATE % _ENCODER.encode(agent_text)
 
 
+@functools.lru_cache(maxsize=32)
 def _make_fake_issue_json(title: str, body: str) -> str:
     """Build a JSON string mimicking the GitHub API response for an issue."""
     return json.dumps({
@@ -75,189 +81,222 @@ def _make_fake_issue_json(title: str, body: str) -> str:
     })
 
 
-@pytest.fixture(autouse=True)
-def set_pdd_path(monkeypatch):
-    """Set PDD_PATH so prompt templates can be loaded."""
-    import pdd
-    pdd_package_dir = Path(pdd.__file__).parent
-    monkeypatch.setenv("PDD_PATH", str(pdd_package_dir))
+_EMPTY_JSON_ARRAY = "[]"
 
+# architecture.json payloads for the project layouts the tests build.
+_ARCH_JSON_AUTH_PAYMENTS = (
+    '[{"filename":"auth_Python.prompt","dependencies":[]},'
+    '{"filename":"payments_Python.prompt","dependencies":["auth_Python.prompt"]}]'
+)
+_ARCH_JSON_USERS = '[{"filename":"users_Python.prompt","dependencies":[]}]'
+_ARCH_JSON_AUTH = '[{"filename":"auth_Python.prompt","dependencies":[]}]'
 
-# ---------------------------------------------------------------------------
-# E2E Test Class
-# ---------------------------------------------------------------------------
+# gh api result for any comments endpoint: the issue has no comments.
+_COMMENTS_RESULT = (True, _EMPTY_JSON_ARRAY)
 
-class TestAgenticSyncCodexE2E:
-    """
-    E2E tests for Issue #557: Agentic sync with OpenAI/Codex provider.
 
-    These tests exercise the full run_agentic_sync pipeline with only external
-    boundaries mocked (GitHub CLI, Codex subprocess, provider availability).
-    All internal parsing, extraction, false-positive detection, and module
-    identification logic runs for real.
-    """
+def _fake_gh_command(issue_json: str):
+    """Simulate gh CLI API calls: the issue itself, or its (empty) comments."""
+    issue_result = (True, issue_json)
 
-    def test_agentic_sync_with_modern_codex_ndjson_identifies_modules(
-        self, tmp_path, monkeypatch
-    ):
-        """
-        E2E: Full agentic sync pipeline with modern Codex NDJSON output.
+    def fake_gh_command(args):
+        return _COMMENTS_RESULT if any("comments" in a for a in args) else issue_result
 
-        When the user runs `pdd sync <github_issue_url> --agentic` and the
-        Codex provider returns modern NDJSON with item.completed events:
-        - The pipeline should parse the NDJSON correctly
-        - Extract the agent_message text containing MODULES_TO_SYNC
-        - Successfully identify the modules to sync
-        - Return success=True
+    return fake_gh_command
 
-        CURRENT BUG: NDJSON parser misses item.completed → empty output →
-        false positive detection → failure. run_agentic_sync returns
-        (False, "LLM failed to identify modules: All agent providers failed: ...")
 
-        AFTER FIX: run_agentic_sync returns (True, ...) with identified modules.
-        """
-        from pdd.agentic_sync import run_agentic_sync
+# Agent-layer boundaries every test mocks: only OpenAI/Codex is available,
+# the codex binary is "found", and retry backoff does not sleep.
+_STANDARD_PATCHES = [
+    ("pdd.agentic_common.get_available_agents", {"return_value": ["openai"]}),
+    ("pdd.agentic_common.get_agent_provider_preference", {"return_value": ["openai"]}),
+    ("pdd.agentic_common._find_cli_binary", {"return_value": "/usr/bin/codex"}),
+    ("time.sleep", {}),
+]
 
-        # Set up a minimal project structure in tmp_path
-        (tmp_path / ".git").mkdir()
-        (tmp_path / "architecture.json").write_text(json.dumps([
-            {"filename": "auth_Python.prompt", "dependencies": []},
-            {"filename": "payments_Python.prompt", "dependencies": ["auth_Python.prompt"]},
-        ]))
-        (tmp_path / "prompts").mkdir()
-        (tmp_path / "prompts" / "auth_Python.prompt").write_text("prompt for auth")
-        (tmp_path / "prompts" / "payments_Python.prompt").write_text("prompt for payments")
 
-        monkeypatch.chdir(tmp_path)
+def _apply_standard_mocks(stack, *, subprocess_stdout, gh_side_effect=None, dry_run_result=None):
+    """Enter the shared patches on ``stack`` and return the mocks tests configure.
 
-        # Modern Codex NDJSON with the structured markers
-        ndjson_output = _build_modern_codex_ndjson_with_modules(
-            ["auth_Python", "payments_Python"]
+    The Codex subprocess always returns ``subprocess_stdout``. Passing
+    ``gh_side_effect`` also mocks the GitHub CLI and the AsyncSyncRunner for the
+    run_agentic_sync pipeline; ``dry_run_result`` mocks _run_dry_run_validation.
+    """
+    stack.enter_context(patch.dict(os.environ, {"OPENAI_API_KEY": "test-key-e2e"}, clear=False))
+    for target, kwargs in _STANDARD_PATCHES:
+        stack.enter_context(patch(target, **kwargs))
+
+    mock_subprocess = stack.enter_context(patch("pdd.agentic_common._subprocess_run"))
+    mock_subprocess.return_value = SimpleNamespace(
+        returncode=0,
+        stdout=subprocess_stdout,
+        stderr=""
+    )
+    mocks = {"subprocess": mock_subprocess}
+
+    if gh_side_effect is not None:
+        stack.enter_context(patch("pdd.agentic_sync._check_gh_cli", return_value=True))
+        stack.enter_context(patch("pdd.agentic_sync._run_gh_command", side_effect=gh_side_effect))
+        # Mock the async sync runner to avoid actually running syncs
+        mock_runner = stack.enter_context(patch("pdd.agentic_sync.AsyncSyncRunner"))
+        mock_runner.return_value = SimpleNamespace(run=lambda: (True, "Sync completed", 0.05))
+        mocks["runner"] = mock_runner
+    if dry_run_result is not None:
+        stack.enter_context(
+            patch("pdd.agentic_sync._run_dry_run_validation", return_value=dry_run_result)
         )
+    return mocks
+
+
+# The CLI scenario only inspects stdout, so stderr is kept out of it.
+_RUNNER = CliRunner(mix_stderr=False)
 
-        # Fake GitHub API responses
-        issue_json = _make_fake_issue_json(
-            title="Update auth and payments modules",
-            body="We need to sync auth and payments modules to match the latest spec.",
+
+def _run_sync_scenario(tmp_path, modules, issue, *, invoke_cli=False):
+    """Run agentic sync for ``modules`` against the mocked boundaries.
+
+    ``issue`` is the (title, body) of the fake GitHub issue. With
+    ``invoke_cli`` the Click `pdd sync <url> --agentic` command is run instead
+    of run_agentic_sync. Returns (succeeded, message or CLI output).
+    """
+    ndjson_output = _build_modern_codex_ndjson_with_modules(modules)
+    fake_gh_command = _fake_gh_command(_make_fake_issue_json(*issue))
+    dry_run_result = None
+    if not invoke_cli:
+        module_cwds = {module.split("_")[0]: tmp_path for module in modules}
+        dry_run_result = (True, module_cwds, [], 0.0)
+
+    with contextlib.ExitStack() as stack:
+        _apply_standard_mocks(
+            stack,
+            subprocess_stdout=ndjson_output,
+            gh_side_effect=fake_gh_command,
+            dry_run_result=dry_run_result,
         )
-        comments_json = json.dumps([])
-
-        def fake_gh_command(args):
-            """Simulate gh CLI API calls."""
-            if "issues" in str(args) and "comments" not in str(args):
-                return True, issue_json
-            return True, comments_json
-
-        with patch.dict(os.environ, {"OPENAI_API_KEY": "test-key-e2e"}, clear=False), \
-             patch("pdd.agentic_sync._check_gh_cli", return_value=True), \
-             patch("pdd.agentic_sync._run_gh_command", side_effect=fake_gh_command), \
-             patch("pdd.agentic_common.get_available_agents", return_value=["openai"]), \
-             patch("pdd.agentic_common.get_agent_provider_preference", return_value=["openai"]), \
-             patch("pdd.agentic_common._find_cli_binary", return_value="/usr/bin/codex"), \
-             patch("pdd.agentic_common._subprocess_run") as mock_subprocess, \
-             patch("time.sleep"), \
-             patch("pdd.agentic_sync._run_dry_run_validation",
-                   return_value=(True, {"auth": tmp_path, "payments": tmp_path}, [], 0.0)), \
-             patch("pdd.agentic_sync.AsyncSyncRunner") as mock_runner:
-            mock_subprocess.return_value = MagicMock(
-                returncode=0,
-                stdout=ndjson_output,
-                stderr=""
-            )
-            mock_runner_instance = MagicMock()
-            mock_runner_instance.run.return_value = (True, "Sync completed", 0.05)
-            mock_runner.return_value = mock_runner_instance
+        if invoke_cli:
+            from pdd import cli
 
-            success, message, cost, provider = run_agentic_sync(
-                issue_url="https://github.com/test/repo/issues/42",
-                verbose=False,
-                quiet=True,
-                agentic_mode=True,
-                use_github_state=False,
+            result = _RUNNER.invoke(
+                cli.cli,
+                ["--force", "--local", "sync",
+                 "https://github.com/test/repo/issues/42",
+                 "--agentic"],
+                catch_exceptions=False,
             )
+            output = result.output or ""
+            return "LLM failed to identify modules" not in output, output
 
-        # Primary assertion: the pipeline must succeed
-        assert success is True, (
-            f"Issue #557 E2E: Agentic sync with modern Codex NDJSON failed. "
-            f"Message: {message}"
+        from pdd.agentic_sync import run_agentic_sync
+
+        success, message, _, _ = run_agentic_sync(
+            issue_url="https://github.com/test/repo/issues/42",
+            verbose=False,
+            quiet=True,
+            agentic_mode=True,
+            use_github_state=False,
         )
+        return success, message
+
+
+# (architecture.json, modules, (issue title, issue body), write prompt files, via CLI)
+SYNC_SCENARIOS = [
+    pytest.param(
+        _ARCH_JSON_AUTH_PAYMENTS,
+        ("auth_Python", "payments_Python"),
+        ("Update auth and payments modules",
+         "We need to sync auth and payments modules to match the latest spec."),
+        True,
+        False,
+        id="run_agentic_sync",
+    ),
+    # The exact failure mode the user reported, with no prompts/ directory.
+    pytest.param(
+        _ARCH_JSON_USERS,
+        ("users_Python",),
+        ("Fix user module", "The users module needs updating."),
+        False,
+        False,
+        id="run_agentic_sync_false_positive",
+    ),
+    pytest.param(
+        _ARCH_JSON_AUTH,
+        ("auth_Python",),
+        ("Update auth module", "Auth needs sync."),
+        True,
+        True,
+        id="cli_sync_command",
+    ),
+]
+
+
+@pytest.fixture(scope="module")
+def canonical_ndjson():
+    """Valid modern Codex NDJSON for tests that need any module list."""
+    return _build_modern_codex_ndjson_with_modules(("auth_Python", "payments_Python"))
+
+
+# Resolved once; the conftest's preserve_pdd_path resets PDD_PATH after every
+# test, so the env var itself still has to be set per test.
+_PDD_PACKAGE_DIR = str(Path(pdd.__file__).parent)
+
+
+@pytest.fixture(autouse=True)
+def set_pdd_path(monkeypatch):
+    """Set PDD_PATH so prompt templates can be loaded."""
+    monkeypatch.setenv("PDD_PATH", _PDD_PACKAGE_DIR)
+
+
+# ---------------------------------------------------------------------------
+# E2E Test Class
+# ---------------------------------------------------------------------------
 
-    def test_agentic_sync_codex_false_positive_on_current_bug(
-        self, tmp_path, monkeypatch
+class TestAgenticSyncCodexE2E:
+    """
+    E2E tests for Issue #557: Agentic sync with OpenAI/Codex provider.
+
+    These tests exercise the full run_agentic_sync pipeline with only external
+    boundaries mocked (GitHub CLI, Codex subprocess, provider availability).
+    All internal parsing, extraction, false-positive detection, and module
+    identification logic runs for real.
+    """
+
+    @pytest.mark.parametrize(
+        "arch_json, modules, issue, with_prompts, invoke_cli", SYNC_SCENARIOS
+    )
+    def test_sync_with_modern_codex_ndjson_identifies_modules(
+        self, tmp_path, monkeypatch, arch_json, modules, issue, with_prompts, invoke_cli
     ):
         """
-        E2E: Confirms the exact failure mode the user reports.
+        E2E: `pdd sync <github_issue_url> --agentic` with modern Codex NDJSON.
 
-        With the current buggy code, run_agentic_sync should fail because:
-        1. NDJSON parser misses the agent_message in item.completed events
-        2. _parse_provider_json extracts empty text
-        3. False positive detection triggers
-        4. All retries exhaust
-        5. run_agentic_sync returns failure with "LLM failed" message
+        When the Codex provider returns modern NDJSON with item.completed events,
+        the pipeline must parse it, extract the agent_message text containing
+        MODULES_TO_SYNC, and identify the modules to sync. Each scenario runs
+        either run_agentic_sync directly or the Click CLI command.
 
-        This test documents the current broken behavior. After the fix is
-        applied, this test should be updated to expect success.
+        BUG: NDJSON parser misses item.completed → empty output → false
+        positive detection → all retries exhaust → "LLM failed to identify
+        modules: All agent providers failed: ...".
         """
-        from pdd.agentic_sync import run_agentic_sync
-
-        # Minimal project setup
         (tmp_path / ".git").mkdir()
-        (tmp_path / "architecture.json").write_text(json.dumps([
-            {"filename": "users_Python.prompt", "dependencies": []},
-        ]))
+        (tmp_path / "architecture.json").write_text(arch_json)
+        if with_prompts:
+            (tmp_path / "prompts").mkdir()
+            for module in modules:
+                basename = module.split("_")[0]
+                (tmp_path / "prompts" / f"{module}.prompt").write_text(f"prompt for {basename}")
 
         monkeypatch.chdir(tmp_path)
 
-        ndjson_output = _build_modern_codex_ndjson_with_modules(["users_Python"])
-
-        issue_json = _make_fake_issue_json(
-            title="Fix user module",
-            body="The users module needs updating.",
-        )
-
-        def fake_gh_command(args):
-            """Simulate gh CLI API calls."""
-            if "issues" in str(args) and "comments" not in str(args):
-                return True, issue_json
-            return True, json.dumps([])
-
-        with patch.dict(os.environ, {"OPENAI_API_KEY": "test-key-e2e"}, clear=False), \
-             patch("pdd.agentic_sync._check_gh_cli", return_value=True), \
-             patch("pdd.agentic_sync._run_gh_command", side_effect=fake_gh_command), \
-             patch("pdd.agentic_common.get_available_agents", return_value=["openai"]), \
-             patch("pdd.agentic_common.get_agent_provider_preference", return_value=["openai"]), \
-             patch("pdd.agentic_common._find_cli_binary", return_value="/usr/bin/codex"), \
-             patch("pdd.agentic_common._subprocess_run") as mock_subprocess, \
-             patch("time.sleep"), \
-             patch("pdd.agentic_sync._run_dry_run_validation",
-                   return_value=(True, {"users": tmp_path}, [], 0.0)), \
-             patch("pdd.agentic_sync.AsyncSyncRunner") as mock_runner:
-            mock_subprocess.return_value = MagicMock(
-                returncode=0,
-                stdout=ndjson_output,
-                stderr=""
-            )
-            mock_runner_instance = MagicMock()
-            mock_runner_instance.run.return_value = (True, "Sync completed", 0.05)
-            mock_runner.return_value = mock_runner_instance
-
-            success, message, cost, provider = run_agentic_sync(
-                issue_url="https://github.com/test/repo/issues/42",
-                verbose=False,
-                quiet=True,
-                agentic_mode=True,
-                use_github_state=False,
-            )
+        succeeded, detail = _run_sync_scenario(tmp_path, modules, issue, invoke_cli=invoke_cli)
 
-        # With the bug: success is False and the message indicates LLM failure
-        # After fix: this assertion should flip to success is True
-        assert success is True, (
-            f"Issue #557 E2E: Current bug causes false positive chain. "
-            f"Message was: {message}"
+        assert succeeded is True, (
+            f"Issue #557 E2E: sync with modern Codex NDJSON failed to identify modules. "
+            f"{'Output' if invoke_cli else 'Message'}: {detail}"
         )
 
     def test_run_agentic_task_codex_ndjson_through_full_retry_loop(
-        self, tmp_path, monkeypatch
+        self, tmp_path, monkeypatch, canonical_ndjson
     ):
         """
         E2E: Exercise run_agentic_task (the core public API) with modern Codex
@@ -275,41 +314,8 @@ class TestAgenticSyncCodexE2E:
         """
         from pdd.agentic_common import run_agentic_task
 
-        agent_text = (
-            "MODULES_TO_SYNC: [auth, payments, users]\n"
-            "DEPS_VALID: true\n"
-            "SYNC_CWD: /app\n"
-            "Analysis complete. The following modules need synchronization."
-        )
-        ndjson_lines = [
-            json.dumps({"type": "session.start", "session_id": "sess_e2e_retry"}),
-            json.dumps({
-                "type": "item.completed",
-                "item": {"type": "tool_call", "name": "read_file", "output": "auth.py contents"}
-            }),
-            json.dumps({
-                "type": "item.completed",
-                "item": {"type": "agent_message", "text": agent_text}
-            }),
-            json.dumps({
-                "type": "session.end",
-                "usage": {"input_tokens": 1000, "output_tokens": 400}
-            }),
-        ]
-        ndjson_output = "\n".join(ndjson_lines)
-
-        with patch.dict(os.environ, {"OPENAI_API_KEY": "test-key-e2e"}, clear=False), \
-             patch("pdd.agentic_common.get_available_agents", return_value=["openai"]), \
-             patch("pdd.agentic_common.get_agent_provider_preference", return_value=["openai"]), \
-             patch("pdd.agentic_common._find_cli_binary", return_value="/usr/bin/codex"), \
-             patch("pdd.agentic_common._subprocess_run") as mock_subprocess, \
-             patch("time.sleep"):
-            mock_subprocess.return_value = MagicMock(
-                returncode=0,
-                stdout=ndjson_output,
-                stderr=""
-            )
-
+        with contextlib.ExitStack() as stack:
+            _apply_standard_mocks(stack, subprocess_stdout=canonical_ndjson)
             success, output, cost, provider = run_agentic_task(
                 instruction="Identify modules that need syncing",
                 cwd=tmp_path,
@@ -330,76 +336,3 @@ class TestAgenticSyncCodexE2E:
         )
         # Cost should be non-zero (calculated from usage stats)
         assert cost >= 0.0
-
-    def test_cli_sync_command_with_codex_provider(self, tmp_path, monkeypatch):
-        """
-        E2E: Exercise the actual Click CLI command for `pdd sync <url>`.
-
-        This is the closest to how a real user invokes the feature. It uses
-        Click's CliRunner to invoke the sync command with a GitHub issue URL,
-        which dispatches to run_agentic_sync.
-
-        CURRENT BUG: CLI exits with "LLM failed to identify modules" because
-        the Codex NDJSON parsing chain fails.
-
-        EXPECTED: CLI exits successfully and reports modules found.
-        """
-        from click.testing import CliRunner
-        from pdd import cli
-
-        # Set up project structure
-        (tmp_path / ".git").mkdir()
-        (tmp_path / "architecture.json").write_text(json.dumps([
-            {"filename": "auth_Python.prompt", "dependencies": []},
-        ]))
-        (tmp_path / "prompts").mkdir()
-        (tmp_path / "prompts" / "auth_Python.prompt").write_text("prompt for auth")
-
-        monkeypatch.chdir(tmp_path)
-
-        ndjson_output = _build_modern_codex_ndjson_with_modules(["auth_Python"])
-
-        issue_json = _make_fake_issue_json(
-            title="Update auth module",
-            body="Auth needs sync.",
-        )
-
-        def fake_gh_command(args):
-            """Simulate gh CLI API calls."""
-            if "issues" in str(args) and "comments" not in str(args):
-                return True, issue_json
-            return True, json.dumps([])
-
-        runner = CliRunner()
-        with patch.dict(os.environ, {"OPENAI_API_KEY": "test-key-e2e"}, clear=False), \
-             patch("pdd.agentic_sync._check_gh_cli", return_value=True), \
-             patch("pdd.agentic_sync._run_gh_command", side_effect=fake_gh_command), \
-             patch("pdd.agentic_common.get_available_agents", return_value=["openai"]), \
-             patch("pdd.agentic_common.get_agent_provider_preference", return_value=["openai"]), \
-             patch("pdd.agentic_common._find_cli_binary", return_value="/usr/bin/codex"), \
-             patch("pdd.agentic_common._subprocess_run") as mock_subprocess, \
-             patch("time.sleep"), \
-             patch("pdd.agentic_sync.AsyncSyncRunner") as mock_runner:
-            mock_subprocess.return_value = MagicMock(
-                returncode=0,
-                stdout=ndjson_output,
-                stderr=""
-            )
-            # Mock the async sync runner to avoid actually running syncs
-            mock_runner_instance = MagicMock()
-            mock_runner_instance.run.return_value = (True, "Sync completed", 0.05)
-            mock_runner.return_value = mock_runner_instance
-
-            result = runner.invoke(
-                cli.cli,
-                ["--force", "--local", "sync",
-                 "https://github.com/test/repo/issues/42",
-                 "--agentic"],
-                catch_exceptions=False,
-            )
-
-        # The CLI should not show "LLM failed" message
-        assert "LLM failed to identify modules" not in (result.output or ""), (
-            f"Issue #557 E2E: CLI reported LLM failure due to Codex NDJSON parsing bug. "
-            f"Output: {result.output}"
-        )
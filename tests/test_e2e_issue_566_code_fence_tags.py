@@ -12,9 +12,12 @@ These tests exercise the full architecture sync pipeline:
 No mocking of the buggy component — hits the real parse_prompt_tags() path.
 """
 
+import itertools
 import json
 from pathlib import Path
 
+import pytest
+
 from pdd.architecture_sync import (
     parse_prompt_tags,
     update_architecture_from_prompt,
@@ -23,26 +26,38 @@ from pdd.architecture_sync import (
 
 
 # ---------------------------------------------------------------------------
-# Helper: set up a realistic project directory with prompts/ + architecture.json
+# Fixture: set up a realistic project directory with prompts/ + architecture.json
 # ---------------------------------------------------------------------------
 
-def _setup_project(tmp_path, prompt_filename, prompt_content, arch_entry):
+@pytest.fixture(scope="module")
+def project_factory(tmp_path_factory):
     """
-    Create a minimal project layout that update_architecture_from_prompt() expects:
-      tmp_path/
+    Return a callable that creates a minimal project layout that
+    update_architecture_from_prompt() expects:
+      <scratch>/projectN/
         prompts/<prompt_filename>   ← the prompt file
         architecture.json           ← array with one module entry
+
+    The scratch root is created once per module. Each call still gets its
+    own project directory because the update rewrites architecture.json.
     """
-    prompts_dir = tmp_path / "prompts"
-    prompts_dir.mkdir()
-    (prompts_dir / prompt_filename).write_text(prompt_content, encoding="utf-8")
+    root = tmp_path_factory.mktemp("issue_566")
+    counter = itertools.count()
+
+    def make_project(prompt_filename, prompt_content, arch_entry):
+        project = root / f"project{next(counter)}"
+        prompts_dir = project / "prompts"
+        prompts_dir.mkdir(parents=True)
+        (prompts_dir / prompt_filename).write_text(prompt_content, encoding="utf-8")
+
+        arch_path = project / "architecture.json"
+        arch_path.write_text(
+            json.dumps([arch_entry], indent=2, ensure_ascii=False) + "\n",
+            encoding="utf-8",
+        )
+        return prompts_dir, arch_path
 
-    arch_path = tmp_path / "architecture.json"
-    arch_path.write_text(
-        json.dumps([arch_entry], indent=2, ensure_ascii=False) + "\n",
-        encoding="utf-8",
-    )
-    return prompts_dir, arch_path
+    return make_project
 
 
 # ---------------------------------------------------------------------------
@@ -55,7 +70,7 @@ class TestIssue566CodeFenceTagsE2E:
     that example tags inside markdown code fences are ignored.
     """
 
-    def test_fenced_example_tags_do_not_overwrite_real_tags(self, tmp_path):
+    def test_fenced_example_tags_do_not_overwrite_real_tags(self, project_factory):
         """
         BUG: When a prompt file has real <pdd-reason> at the top and an
         example <pdd-reason> inside a code fence, the parser should use the
@@ -77,8 +92,7 @@ Here is an example of how to write tags:
 <pdd-dependency>example_dep_python.prompt</pdd-dependency>
 ```
 """
-        prompts_dir, arch_path = _setup_project(
-            tmp_path,
+        prompts_dir, arch_path = project_factory(
             "my_module_python.prompt",
             prompt_content,
             {
@@ -113,7 +127,7 @@ Here is an example of how to write tags:
             "parse_prompt_tags() extracted dependencies from inside a code fence."
         )
 
-    def test_real_header_tag_not_overwritten_by_fenced_example_in_body(self, tmp_path):
+    def test_real_header_tag_not_overwritten_by_fenced_example_in_body(self, project_factory):
         """
         BUG: The buggy whole-file parser uses .find(), which returns the first
         match in document order.  When a fenced example exists in a body section
@@ -138,8 +152,7 @@ Here is an example of how to write tags:
 <pdd-reason>Example: Orchestrates the workflow</pdd-reason>
 ```
 """
-        prompts_dir, arch_path = _setup_project(
-            tmp_path,
+        prompts_dir, arch_path = project_factory(
             "auth_python.prompt",
             prompt_content,
             {
@@ -167,7 +180,7 @@ Here is an example of how to write tags:
             "Fenced example tag was extracted because it appeared first."
         )
 
-    def test_only_fenced_tags_produces_no_metadata(self, tmp_path):
+    def test_only_fenced_tags_produces_no_metadata(self, project_factory):
         """
         BUG: A prompt file that has NO real tags — only examples inside code
         fences — should not produce any metadata. But the buggy parser
@@ -194,8 +207,7 @@ You are an expert software engineer. Update the architecture.
 <pdd-dependency>path_resolution_python.prompt</pdd-dependency>
 ```
 """
-        prompts_dir, arch_path = _setup_project(
-            tmp_path,
+        prompts_dir, arch_path = project_factory(
             "step10_python.prompt",
             prompt_content,
             {
@@ -0,0 +1,52 @@
+"""Tests for pdd.file_signature_cache."""
+
+import os
+
+from pdd.file_signature_cache import (
+    RACY_WINDOW_NS,
+    FileSignatureCache,
+    file_signature,
+    read_started_ns,
+)
+
+
+def _backdate(path, seconds=60):
+    mtime_ns = path.stat().st_mtime_ns - seconds * 10**9
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+class TestFileSignatureCache:
+
+    def test_hit_while_signature_matches(self, tmp_path):
+        path = tmp_path / "a.txt"
+        path.write_text("one")
+        _backdate(path)
+        cache = FileSignatureCache()
+        signature = (file_signature(path),)
+
+        cache.put("a", signature, "value", read_started_ns())
+
+        assert cache.get("a", signature) == "value"
+        path.write_text("two!")
+        assert cache.get("a", (file_signature(path),)) is None
+
+    def test_racily_clean_entry_is_not_stored(self, tmp_path):
+        path = tmp_path / "a.txt"
+        path.write_text("one")
+        cache = FileSignatureCache()
+        signature = (file_signature(path),)
+
+        cache.put("a", signature, "value", signature[0][0] + RACY_WINDOW_NS)
+
+        assert cache.get("a", signature) is None
+        assert len(cache) == 0
+
+    def test_oldest_entry_evicted_at_maxsize(self):
+        cache = FileSignatureCache(maxsize=2)
+        signature = ((0, 1),)
+        for key in ("a", "b", "c"):
+            cache.put(key, signature, key, read_started_ns())
+
+        assert len(cache) == 2
+        assert cache.get("a", signature) is None
+        assert cache.get("c", signature) == "c"
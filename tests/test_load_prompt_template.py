@@ -6,7 +6,22 @@ from unittest.mock import patch, mock_open
 from pathlib import Path
 
 # Assuming the module is located at pdd/load_prompt_template.py
-from pdd.load_prompt_template import load_prompt_template
+from pdd.load_prompt_template import clear_prompt_template_cache, load_prompt_template
+
+
+@pytest.fixture(autouse=True)
+def _fresh_template_cache():
+    """Keep cached templates from leaking between tests."""
+    clear_prompt_template_cache()
+    yield
+    clear_prompt_template_cache()
+
+
+def _backdate(path, seconds=60):
+    """Move a file's mtime into the past so its signature is cacheable."""
+    mtime_ns = path.stat().st_mtime_ns - seconds * 10**9
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
 
 # Test Case 1: Successful loading of a prompt template
 def test_load_prompt_template_success(monkeypatch):
@@ -210,3 +225,46 @@ def test_load_prompt_template_installed_package_location(monkeypatch, capsys, tm
     
     # Once fixed, this assertion should pass
     assert result == expected_content, f"Expected to load prompt from installed package location"
+
+# Test Case: Repeated loads of an unchanged file are served from the cache
+def test_load_prompt_template_caches_unchanged_file(monkeypatch, tmp_path, capsys):
+    prompts_dir = tmp_path / "prompts"
+    prompts_dir.mkdir()
+    prompt_file = prompts_dir / "cached_prompt.prompt"
+    prompt_file.write_text("first version", encoding='utf-8')
+    _backdate(prompt_file)
+    monkeypatch.setenv("PDD_PATH", str(tmp_path))
+
+    assert load_prompt_template("cached_prompt") == "first version"
+    assert "Successfully loaded prompt: cached_prompt" in capsys.readouterr().out
+    with patch("builtins.open", side_effect=AssertionError("file re-read")):
+        assert load_prompt_template("cached_prompt") == "first version"
+    # A cache hit is not reported as a load
+    assert "Successfully loaded prompt" not in capsys.readouterr().out
+
+    # A changed file (new size/mtime) is re-read
+    prompt_file.write_text("second, longer version", encoding='utf-8')
+    assert load_prompt_template("cached_prompt") == "second, longer version"
+
+    # An explicit cache clear forces a re-read
+    _backdate(prompt_file)
+    load_prompt_template("cached_prompt")
+    clear_prompt_template_cache()
+    with patch("builtins.open", mock_open(read_data="reloaded")):
+        assert load_prompt_template("cached_prompt") == "reloaded"
+
+# Test Case: A same-size edit within one timestamp tick is not served stale
+def test_load_prompt_template_rereads_same_size_edit_within_one_tick(monkeypatch, tmp_path):
+    prompts_dir = tmp_path / "prompts"
+    prompts_dir.mkdir()
+    prompt_file = prompts_dir / "racy_prompt.prompt"
+    prompt_file.write_text("version A", encoding='utf-8')
+    monkeypatch.setenv("PDD_PATH", str(tmp_path))
+
+    assert load_prompt_template("racy_prompt") == "version A"
+
+    stat = prompt_file.stat()
+    prompt_file.write_text("version B", encoding='utf-8')
+    os.utime(prompt_file, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+    assert load_prompt_template("racy_prompt") == "version B"